@@ -73,7 +73,7 @@ class ContextBuilder:
                 session_info.append(f"Current mood: {current_mood}")
             if current_topic:
                 session_info.append(f"Topic: {current_topic}")
-            parts.append(f"\nCURRENT SESSION:\n" + " | ".join(session_info))
+            parts.append(f"\nCURRENT SESSION:\n{' | '.join(session_info)}")
         
         # Add conversation history (most important - always include)
         if conversation_history:
@@ -110,7 +110,7 @@ class ContextBuilder:
             else:
                 parts.append(f"- Regular user ({count} interactions)")
         
-        return "\n".join(parts) if parts else ""
+        return "\n".join(parts)
     
     def _format_summaries(self, summaries: List[Dict[str, Any]]) -> str:
         """Format past conversation summaries."""
@@ -8,8 +8,22 @@ Reduces token usage by:
 - Compressing verbose exchanges
 """
 
+from functools import lru_cache
+from itertools import groupby
 from typing import List, Dict, Any, Optional
 import re
+import sys
+
+
+# Word tokenizer; \w+ keeps the same word boundaries as \b...\b patterns
+_WORD_RX = re.compile(r"\w+")
+
+# Mood names end up in emotional arcs and are compared downstream
+_MOODS = tuple(map(sys.intern, ("happy", "sad", "anxious", "angry", "neutral")))
+_HAPPY, _SAD, _ANXIOUS, _ANGRY, _NEUTRAL = _MOODS
+
+# Short messages repeat often enough to be worth memoizing
+_CACHEABLE_LENGTH = 80
 
 
 class ConversationSummarizer:
@@ -23,14 +37,18 @@ class ConversationSummarizer:
     - Topic transitions
     """
     
-    def __init__(self, compression_ratio: float = 0.3):
+    _EMOTIONAL_MARKERS = ("!", "...", "😢", "😭", "❤️", "💔", "😡", "🎉")
+    
+    def __init__(self, compression_ratio: float = 0.3, summary_threshold: int = 10):
         """
         Initialize summarizer.
         
         Args:
             compression_ratio: Target ratio of summary to original (0.3 = 30%)
+            summary_threshold: Minimum messages before summarizing
         """
         self.compression_ratio = compression_ratio
+        self.summary_threshold = summary_threshold
         self.importance_keywords = [
             "important", "remember", "always", "never",
             "love", "hate", "feel", "felt",
@@ -38,6 +56,45 @@ class ConversationSummarizer:
             "family", "friend", "job", "work",
             "happy", "sad", "excited", "worried"
         ]
+        self.mood_keywords = {
+            _HAPPY: ["happy", "great", "good", "excited", "awesome", "love"],
+            _SAD: ["sad", "down", "depressed", "unhappy", "hurt"],
+            _ANXIOUS: ["anxious", "worried", "stressed", "nervous", "scared"],
+            _ANGRY: ["angry", "mad", "frustrated", "annoyed", "pissed"],
+            _NEUTRAL: ["okay", "fine", "alright"]
+        }
+        
+        # Importance keywords are matched in one pass. The zero-width
+        # lookahead reports overlapping hits, so the distinct matches equal
+        # what a per-keyword `in` check would find.
+        self._importance_rx = re.compile(
+            "(?=({}))".format("|".join(map(re.escape, self.importance_keywords)))
+        )
+        self._mood_sets = {
+            mood: frozenset(keywords)
+            for mood, keywords in self.mood_keywords.items()
+        }
+        self._guess_mood_cached = lru_cache(maxsize=2048)(self._guess_mood_uncached)
+        
+        # Common topic keywords
+        self._topic_word_sets = {
+            "work": frozenset({"work", "job", "career", "office", "boss", "colleague", "project"}),
+            "family": frozenset({"family", "mom", "dad", "sister", "brother", "parent", "kid", "child"}),
+            "relationship": frozenset({"girlfriend", "boyfriend", "partner", "dating", "relationship", "marriage"}),
+            "health": frozenset({"health", "sick", "doctor", "hospital", "medicine", "therapy"}),
+            "education": frozenset({"school", "college", "university", "class", "study", "exam", "degree"}),
+            "hobby": frozenset({"hobby", "game", "gaming", "anime", "music", "art", "sport", "reading"}),
+            "travel": frozenset({"travel", "trip", "vacation", "flight", "hotel", "visit"}),
+            "finance": frozenset({"money", "salary", "budget", "expensive", "cheap", "cost", "price"}),
+        }
+        
+        # Revelation patterns for key-moment detection
+        self._revelation_patterns = [
+            re.compile(r'\bi (just|finally|recently|actually)\b'),
+            re.compile(r'\bturns? out\b'),
+            re.compile(r'\brealized\b'),
+            re.compile(r'\bfound out\b'),
+        ]
     
     def summarize_conversation(
         self,
@@ -62,6 +119,17 @@ class ConversationSummarizer:
                 "emotional_arc": None
             }
         
+        # Too short to compress meaningfully; skip the analysis entirely
+        if not self.should_summarize(len(exchanges)):
+            return {
+                "summary": "",
+                "key_moments": [],
+                "topics": [],
+                "emotional_arc": None,
+                "original_count": len(exchanges),
+                "tokens_saved": 0
+            }
+        
         # Extract text from exchanges
         user_messages = [
             ex["content"] for ex in exchanges 
@@ -71,13 +139,22 @@ class ConversationSummarizer:
         # Identify topics
         topics = self._extract_topics(user_messages)
         
-        # Identify key moments
+        # Split into topic-coherent segments
+        segments = self._segment_exchanges(exchanges)
+        
+        # Identify key moments (first important message of each segment)
         key_moments = []
         if extract_key_moments:
-            key_moments = self._extract_key_moments(user_messages)
+            for segment in segments:
+                key_moments.extend(self._extract_key_moments(
+                    [ex["content"] for ex in segment if ex.get("role") == "user"],
+                    limit=1
+                ))
+                if len(key_moments) >= 5:  # Max 5 key moments
+                    break
         
         # Detect emotional arc
-        emotional_arc = self._detect_emotional_arc(exchanges)
+        emotional_arc = self._detect_emotional_arc(exchanges, segments)
         
         # Generate summary text
         summary = self._generate_summary(user_messages, topics, key_moments)
@@ -93,30 +170,70 @@ class ConversationSummarizer:
     
     def _extract_topics(self, messages: List[str]) -> List[str]:
         """Extract main topics from messages."""
-        topics = set()
+        topics = []
         
-        # Common topic keywords
-        topic_patterns = {
-            "work": r"\b(work|job|career|office|boss|colleague|project)\b",
-            "family": r"\b(family|mom|dad|sister|brother|parent|kid|child)\b",
-            "relationship": r"\b(girlfriend|boyfriend|partner|dating|relationship|marriage)\b",
-            "health": r"\b(health|sick|doctor|hospital|medicine|therapy)\b",
-            "education": r"\b(school|college|university|class|study|exam|degree)\b",
-            "hobby": r"\b(hobby|game|gaming|anime|music|art|sport|reading)\b",
-            "travel": r"\b(travel|trip|vacation|flight|hotel|visit)\b",
-            "finance": r"\b(money|salary|budget|expensive|cheap|cost|price)\b",
+        # Tokenize message by message rather than joining them into one copy
+        tokens = set()
+        for message in messages:
+            tokens.update(_WORD_RX.findall(message.lower()))
+        
+        for topic, words in self._topic_word_sets.items():
+            if words & tokens:
+                topics.append(topic)
+                if len(topics) >= 5:  # Max 5 topics
+                    break
+        
+        return topics
+    
+    def _message_topics(self, message: str) -> set:
+        """Get the set of topics mentioned in a single message."""
+        tokens = set(_WORD_RX.findall(message.lower()))
+        return {
+            topic for topic, words in self._topic_word_sets.items()
+            if words & tokens
         }
+    
+    def _segment_exchanges(
+        self,
+        exchanges: List[Dict[str, str]],
+        min_overlap: float = 0.3
+    ) -> List[List[Dict[str, str]]]:
+        """
+        Split exchanges into consecutive, topic-coherent segments.
         
-        combined_text = " ".join(messages).lower()
+        An exchange starts a new segment when its topics overlap the current
+        segment's topics by less than min_overlap (Jaccard similarity).
+        Exchanges without a detectable topic continue the current segment.
+        
+        Args:
+            exchanges: List of message exchanges
+            min_overlap: Minimum Jaccard similarity to stay in a segment
+            
+        Returns:
+            List of segments, each a list of exchanges
+        """
+        segments = []
+        segment_topics = set()
         
-        for topic, pattern in topic_patterns.items():
-            if re.search(pattern, combined_text, re.IGNORECASE):
-                topics.add(topic)
+        for exchange in exchanges:
+            topics = self._message_topics(exchange.get("content", ""))
+            
+            starts_new = not segments
+            if topics and segment_topics:
+                overlap = len(topics & segment_topics) / len(topics | segment_topics)
+                starts_new = overlap < min_overlap
+            
+            if starts_new:
+                segments.append([])
+                segment_topics = set()
+            
+            segments[-1].append(exchange)
+            segment_topics |= topics
         
-        return list(topics)[:5]  # Max 5 topics
+        return segments
     
-    def _extract_key_moments(self, messages: List[str]) -> List[str]:
-        """Extract key moments from conversation."""
+    def _extract_key_moments(self, messages: List[str], limit: int = 5) -> List[str]:
+        """Extract up to limit key moments from conversation."""
         key_moments = []
         
         for message in messages:
@@ -125,73 +242,78 @@ class ConversationSummarizer:
                 # Truncate if too long
                 moment = message[:100] + "..." if len(message) > 100 else message
                 key_moments.append(moment)
+                if len(key_moments) >= limit:
+                    break
         
-        return key_moments[:5]  # Max 5 key moments
+        return key_moments
     
     def _is_important_message(self, message: str) -> bool:
         """Determine if a message is important enough to be a key moment."""
         message_lower = message.lower()
         
-        # Check for importance keywords
-        importance_score = sum(
-            1 for keyword in self.importance_keywords 
-            if keyword in message_lower
-        )
+        # Check for importance keywords (one scan)
+        score = len(set(self._importance_rx.findall(message_lower)))
+        if score >= 2:
+            return True
         
-        # Check for emotional markers
-        emotional_markers = ["!", "...", "😢", "😭", "❤️", "💔", "😡", "🎉"]
-        emotion_score = sum(
-            1 for marker in emotional_markers 
-            if marker in message
-        )
+        # Count emotional markers
+        score += sum(map(message.count, self._EMOTIONAL_MARKERS))
+        if score >= 2:
+            return True
         
         # Check for revelation patterns
-        revelation_patterns = [
-            r'\bi (just|finally|recently|actually)\b',
-            r'\bturns? out\b',
-            r'\brealized\b',
-            r'\bfound out\b',
-        ]
-        revelation_score = sum(
-            1 for pattern in revelation_patterns
-            if re.search(pattern, message_lower)
-        )
-        
-        total_score = importance_score + emotion_score + revelation_score
+        for pattern in self._revelation_patterns:
+            if pattern.search(message_lower):
+                score += 1
+                if score >= 2:
+                    return True
         
-        return total_score >= 2
+        return False
     
-    def _detect_emotional_arc(self, exchanges: List[Dict[str, str]]) -> Optional[str]:
-        """Detect the emotional journey through the conversation."""
+    def _detect_emotional_arc(
+        self,
+        exchanges: List[Dict[str, str]],
+        segments: Optional[List[List[Dict[str, str]]]] = None
+    ) -> Optional[str]:
+        """
+        Detect the emotional journey through the conversation.
+        
+        Guesses one mood per topic segment from the user's messages and
+        collapses consecutive repeats, e.g. "sad → happy".
+        """
         if len(exchanges) < 3:
             return None
         
-        # Simple emotional arc detection
-        start_mood = self._guess_mood(exchanges[0].get("content", ""))
-        mid_mood = self._guess_mood(exchanges[len(exchanges)//2].get("content", ""))
-        end_mood = self._guess_mood(exchanges[-1].get("content", ""))
+        if segments is None:
+            segments = self._segment_exchanges(exchanges)
         
-        moods = [m for m in [start_mood, mid_mood, end_mood] if m]
+        moods = []
+        for segment in segments:
+            user_text = " ".join(
+                ex.get("content", "") for ex in segment
+                if ex.get("role") == "user"
+            )
+            mood = self._guess_mood(user_text)
+            if mood:
+                moods.append(mood)
         
-        if len(moods) >= 2:
-            return " → ".join(moods)
+        if moods:
+            return " → ".join(mood for mood, _ in groupby(moods))
         
         return None
     
     def _guess_mood(self, text: str) -> Optional[str]:
         """Guess mood from text."""
-        text_lower = text.lower()
-        
-        mood_keywords = {
-            "happy": ["happy", "great", "good", "excited", "awesome", "love"],
-            "sad": ["sad", "down", "depressed", "unhappy", "hurt"],
-            "anxious": ["anxious", "worried", "stressed", "nervous", "scared"],
-            "angry": ["angry", "mad", "frustrated", "annoyed", "pissed"],
-            "neutral": ["okay", "fine", "alright"]
-        }
+        if len(text) <= _CACHEABLE_LENGTH:
+            return self._guess_mood_cached(text)
+        return self._guess_mood_uncached(text)
+    
+    def _guess_mood_uncached(self, text: str) -> Optional[str]:
+        """Guess mood from text without consulting the cache."""
+        tokens = set(_WORD_RX.findall(text.lower()))
         
-        for mood, keywords in mood_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for mood, words in self._mood_sets.items():
+            if words & tokens:
                 return mood
         
         return None
@@ -233,26 +355,31 @@ class ConversationSummarizer:
         summary: str
     ) -> int:
         """Estimate tokens saved by summarization."""
-        original_text = " ".join(
-            ex.get("content", "") for ex in original_exchanges
-        )
+        # Sum lengths directly instead of materializing the joined text; the
+        # separators a space-join would add are counted so the estimate
+        # stays the same
+        original_chars = sum(len(ex.get("content", "")) for ex in original_exchanges)
+        original_chars += max(len(original_exchanges) - 1, 0)
         
-        original_tokens = len(original_text) // 4  # Rough estimate
+        original_tokens = original_chars // 4  # Rough estimate
         summary_tokens = len(summary) // 4
         
         return max(0, original_tokens - summary_tokens)
     
-    def should_summarize(self, message_count: int, threshold: int = 10) -> bool:
+    def should_summarize(self, message_count: int, threshold: Optional[int] = None) -> bool:
         """
         Determine if conversation should be summarized.
         
         Args:
             message_count: Number of messages in conversation
-            threshold: Minimum messages before summarizing
+            threshold: Minimum messages before summarizing (defaults to
+                the summarizer's summary_threshold)
             
         Returns:
             True if should summarize
         """
+        if threshold is None:
+            threshold = self.summary_threshold
         return message_count >= threshold
     
     def merge_summaries(self, summaries: List[str]) -> str:
@@ -271,12 +398,8 @@ class ConversationSummarizer:
         if len(summaries) == 1:
             return summaries[0]
         
-        # Simple concatenation with numbering
-        merged = []
-        for i, summary in enumerate(summaries, 1):
-            merged.append(f"[{i}] {summary}")
-        
-        return " | ".join(merged)
+        # Simple concatenation with numbering (list-comp lets join pre-size)
+        return " | ".join([f"[{i}] {summary}" for i, summary in enumerate(summaries, 1)])
     
     def __repr__(self) -> str:
         return f"ConversationSummarizer(compression={self.compression_ratio})"
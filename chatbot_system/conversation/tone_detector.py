@@ -12,13 +12,60 @@ Detects emotional states like:
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Pattern
 import re
+import sys
 
 
-@dataclass
+# Tone names are compared and used as dict keys on every message
+_TONES = tuple(map(sys.intern, (
+    "sad", "excited", "angry", "anxious", "sarcastic", "happy", "casual"
+)))
+_SAD, _EXCITED, _ANGRY, _ANXIOUS, _SARCASTIC, _HAPPY, _CASUAL = _TONES
+_STRONG_SIGNALS = frozenset((_SAD, _ANGRY, _ANXIOUS, _EXCITED))
+
+# Every byte except ASCII A-Z, for counting capitals with bytes.translate
+_NON_UPPER_BYTES = bytes(b for b in range(256) if not 65 <= b <= 90)
+
+# Short utterances ("ok", "lol", "thanks") repeat a lot; longer ones rarely do
+_CACHEABLE_LENGTH = 80
+
+
+def _compile(groups: Dict[str, List[str]]) -> Dict[str, List[Pattern]]:
+    """Compile each category's patterns once, case-insensitively."""
+    return {
+        name: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        for name, patterns in groups.items()
+    }
+
+
+def _fuse(groups: Dict[str, List[str]]) -> Pattern:
+    """
+    Fuse every pattern of every category into one alternation.
+    
+    Only used to ask "does anything match at all?": a search over the
+    alternation hits iff some pattern hits. It can't be used for counting,
+    since an alternation keeps one hit per position (the first alternative)
+    and cross-span patterns like the sarcasm one swallow later hits.
+    """
+    return re.compile(
+        "|".join(f"(?:{pattern})" for patterns in groups.values() for pattern in patterns),
+        re.IGNORECASE
+    )
+
+
+def _count_upper(text: str) -> int:
+    """Count uppercase characters, with a single C-level pass for ASCII text."""
+    if text.isascii():
+        return len(text.encode("ascii").translate(None, _NON_UPPER_BYTES))
+    return sum(map(str.isupper, text))
+
+
+@dataclass(frozen=True, slots=True)
 class EmotionalTone:
-    """Detected emotional tone with confidence."""
+    """Detected emotional tone with confidence (immutable, hashable)."""
     
     primary: str  # Main detected tone
     secondary: Optional[str] = None  # Secondary tone if mixed
@@ -40,109 +87,164 @@ class ToneDetector:
     - Formality level (casual, neutral, formal)
     """
     
+    # Response guidance per tone; read-only and shared by all instances
+    _GUIDANCE = MappingProxyType({
+        _SAD: MappingProxyType({
+            "style": "empathetic, soft, supportive",
+            "avoid": ("toxic positivity", "dismissing feelings", "overexplaining"),
+            "include": ("validation", "presence", "gentle support")
+        }),
+        _EXCITED: MappingProxyType({
+            "style": "enthusiastic, energetic, celebratory",
+            "avoid": ("dampening energy", "being too serious"),
+            "include": ("exclamation points", "matching excitement", "follow-up questions")
+        }),
+        _ANGRY: MappingProxyType({
+            "style": "calm, validating, space-giving",
+            "avoid": ("dismissing anger", "taking it personally", "being defensive"),
+            "include": ("acknowledgment", "empathy", "patience")
+        }),
+        _ANXIOUS: MappingProxyType({
+            "style": "reassuring, grounding, patient",
+            "avoid": ("minimizing concerns", "rushing", "adding pressure"),
+            "include": ("calm presence", "practical support", "validation")
+        }),
+        _SARCASTIC: MappingProxyType({
+            "style": "playful, witty, banter-ready",
+            "avoid": ("taking too seriously", "being overly sincere"),
+            "include": ("light humor", "playful responses", "matching wit")
+        }),
+        _HAPPY: MappingProxyType({
+            "style": "warm, positive, engaged",
+            "avoid": ("dampening mood", "being cynical"),
+            "include": ("genuine interest", "positive energy", "celebration")
+        }),
+        _CASUAL: MappingProxyType({
+            "style": "relaxed, conversational, natural",
+            "avoid": ("being too formal", "overthinking"),
+            "include": ("casual language", "easy flow", "authenticity")
+        })
+    })
+    
     def __init__(self):
         """Initialize tone detector with pattern rules."""
         
-        # Emotional indicators
-        self.sad_patterns = [
-            r'\b(sad|depressed|down|unhappy|miserable|hopeless|lonely|crying|cry)\b',
-            r'\b(feel like shit|feeling down|not okay|feeling bad)\b',
-            r'😢|😭|😔|😞|☹️|💔',
-        ]
-        
-        self.excited_patterns = [
-            r'\b(excited|amazing|awesome|great|fantastic|wonderful|omg|wow|yay)\b',
-            r'\b(so happy|super happy|really happy|love it|love this)\b',
-            r'!!+',  # Multiple exclamation marks
-            r'😃|😄|😁|🎉|🔥|💪|✨|🙌',
-        ]
-        
-        self.angry_patterns = [
-            r'\b(angry|mad|pissed|frustrated|annoyed|hate|furious|wtf)\b',
-            r'\b(so annoying|really annoyed|pissing me off)\b',
-            r'😠|😡|🤬|💢',
-        ]
-        
-        self.anxious_patterns = [
-            r'\b(anxious|worried|nervous|scared|afraid|stressed|stress|panic)\b',
-            r'\b(freaking out|stressing out|really worried)\b',
-            r'😰|😨|😥|😟',
-        ]
-        
-        self.sarcastic_patterns = [
-            r'/s\b',  # Explicit sarcasm tag
-            r'\b(yeah right|sure|obviously|totally|oh wow)\b.*\b(not|yeah)\b',
-            r'🙄',
-        ]
-        
-        self.happy_patterns = [
-            r'\b(happy|good|nice|cool|glad|pleased|content)\b',
-            r'\b(going well|pretty good|doing good)\b',
-            r'😊|☺️|😌|🙂|😀',
-        ]
+        # Emotional indicators (group order doubles as tie-break order)
+        self.emotion_patterns = {
+            _SAD: [
+                r'\b(sad|depressed|down|unhappy|miserable|hopeless|lonely|crying|cry)\b',
+                r'\b(feel like shit|feeling down|not okay|feeling bad)\b',
+                r'😢|😭|😔|😞|☹️|💔',
+            ],
+            _EXCITED: [
+                r'\b(excited|amazing|awesome|great|fantastic|wonderful|omg|wow|yay)\b',
+                r'\b(so happy|super happy|really happy|love it|love this)\b',
+                r'!!+',  # Multiple exclamation marks
+                r'😃|😄|😁|🎉|🔥|💪|✨|🙌',
+            ],
+            _ANGRY: [
+                r'\b(angry|mad|pissed|frustrated|annoyed|hate|furious|wtf)\b',
+                r'\b(so annoying|really annoyed|pissing me off)\b',
+                r'😠|😡|🤬|💢',
+            ],
+            _ANXIOUS: [
+                r'\b(anxious|worried|nervous|scared|afraid|stressed|stress|panic)\b',
+                r'\b(freaking out|stressing out|really worried)\b',
+                r'😰|😨|😥|😟',
+            ],
+            _SARCASTIC: [
+                r'/s\b',  # Explicit sarcasm tag
+                r'\b(yeah right|sure|obviously|totally|oh wow)\b.*\b(not|yeah)\b',
+                r'🙄',
+            ],
+            _HAPPY: [
+                r'\b(happy|good|nice|cool|glad|pleased|content)\b',
+                r'\b(going well|pretty good|doing good)\b',
+                r'😊|☺️|😌|🙂|😀',
+            ],
+        }
         
         # Energy level indicators
-        self.high_energy = [
-            r'!!+',
-            r'[A-Z]{2,}',  # CAPS
-            r'\b(omg|wow|yay|yes|let\'?s go|hype|pumped)\b',
-        ]
-        
-        self.low_energy = [
-            r'\b(tired|exhausted|whatever|meh|idk|dunno)\b',
-            r'\.\.\.+',  # Trailing dots
-            r'\b(not really|i guess|maybe)\b',
-        ]
+        self.energy_patterns = {
+            "high": [
+                r'!!+',
+                r'[A-Z]{2,}',  # CAPS
+                r'\b(omg|wow|yay|yes|let\'?s go|hype|pumped)\b',
+            ],
+            "low": [
+                r'\b(tired|exhausted|whatever|meh|idk|dunno)\b',
+                r'\.\.\.+',  # Trailing dots
+                r'\b(not really|i guess|maybe)\b',
+            ],
+        }
         
         # Formality indicators
-        self.formal_patterns = [
-            r'\b(therefore|furthermore|however|subsequently|indeed)\b',
-            r'\b(would like to|shall|ought to)\b',
-        ]
+        self.formality_patterns = {
+            "formal": [
+                r'\b(therefore|furthermore|however|subsequently|indeed)\b',
+                r'\b(would like to|shall|ought to)\b',
+            ],
+            "casual": [
+                r'\b(gonna|wanna|gotta|kinda|sorta|yeah|yep|nah|lol|haha)\b',
+                r'\b(what\'?s up|how\'?s it going|sup|yo)\b',
+            ],
+        }
+        
+        # Patterns are counted one by one (hits may overlap across patterns);
+        # a fused prefilter per dimension skips that for messages with no hit
+        self._emotion_rx = _compile(self.emotion_patterns)
+        self._energy_rx = _compile(self.energy_patterns)
+        self._formality_rx = _compile(self.formality_patterns)
+        self._emotion_any = _fuse(self.emotion_patterns)
+        self._formality_any = _fuse(self.formality_patterns)
         
-        self.casual_patterns = [
-            r'\b(gonna|wanna|gotta|kinda|sorta|yeah|yep|nah|lol|haha)\b',
-            r'\b(what\'?s up|how\'?s it going|sup|yo)\b',
-        ]
+        # Memoize results for short messages (EmotionalTone is immutable)
+        self._detect_cached = lru_cache(maxsize=2048)(self._detect_uncached)
     
-    def detect(self, message: str) -> EmotionalTone:
+    def detect(self, message: str, message_lower: Optional[str] = None) -> EmotionalTone:
         """
         Detect emotional tone from a message.
         
         Args:
             message: User message text
+            message_lower: message.lower(), if the caller already has it
             
         Returns:
             EmotionalTone object with detected characteristics
         """
-        message_lower = message.lower()
+        if len(message) <= _CACHEABLE_LENGTH:
+            return self._detect_cached(message)
+        return self._detect_uncached(message, message_lower)
+    
+    def _detect_uncached(self, message: str, message_lower: Optional[str] = None) -> EmotionalTone:
+        """Run the full tone analysis on a message."""
+        if message_lower is None:
+            message_lower = message.lower()
         
         # Score each emotion
-        scores = {
-            "sad": self._count_matches(message_lower, self.sad_patterns),
-            "excited": self._count_matches(message_lower, self.excited_patterns),
-            "angry": self._count_matches(message_lower, self.angry_patterns),
-            "anxious": self._count_matches(message_lower, self.anxious_patterns),
-            "sarcastic": self._count_matches(message_lower, self.sarcastic_patterns),
-            "happy": self._count_matches(message_lower, self.happy_patterns),
-        }
+        scores = self._tally(message_lower, self._emotion_rx, self._emotion_any)
         
-        # Find primary emotion
-        max_score = max(scores.values())
+        # Find primary and secondary emotion in one pass (ties keep group order)
+        best, best_score = _CASUAL, 0
+        second, second_score = None, 0
+        for name, score in scores.items():
+            if score > best_score:
+                second, second_score = best, best_score
+                best, best_score = name, score
+            elif score > second_score:
+                second, second_score = name, score
         
-        if max_score == 0:
-            primary = "casual"
+        primary = best
+        if best_score == 0:
             confidence = 0.5
         else:
-            primary = max(scores, key=scores.get)
-            confidence = min(max_score * 0.3, 1.0)  # Scale to 0-1
+            confidence = min(best_score * 0.3, 1.0)  # Scale to 0-1
         
-        # Find secondary emotion if present
-        scores_sorted = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        secondary = scores_sorted[1][0] if scores_sorted[1][1] > 0 else None
+        secondary = second if second_score > 0 else None
         
         # Detect energy level
-        energy_level = self._detect_energy(message, message_lower)
+        upper_count = _count_upper(message)
+        energy_level = self._detect_energy(message, message_lower, upper_count)
         
         # Detect formality
         formality = self._detect_formality(message_lower)
@@ -155,25 +257,46 @@ class ToneDetector:
             formality=formality
         )
     
-    def _count_matches(self, text: str, patterns: list) -> int:
-        """Count pattern matches in text."""
-        count = 0
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            count += len(matches)
-        return count
+    def _tally(
+        self,
+        text: str,
+        groups: Dict[str, List[Pattern]],
+        prefilter: Optional[Pattern] = None
+    ) -> Dict[str, int]:
+        """
+        Count pattern hits per category (keys keep group order, the tie-break order).
+        
+        Each pattern counts its own non-overlapping hits, so one span can
+        score in several categories. When prefilter finds nothing, no
+        pattern can match and the per-pattern scans are skipped.
+        """
+        if prefilter is not None and prefilter.search(text) is None:
+            return dict.fromkeys(groups, 0)
+        return {
+            name: sum(len(pattern.findall(text)) for pattern in patterns)
+            for name, patterns in groups.items()
+        }
     
-    def _detect_energy(self, original: str, lower: str) -> str:
-        """Detect energy level (high/medium/low)."""
-        high_score = self._count_matches(lower, self.high_energy)
-        low_score = self._count_matches(lower, self.low_energy)
+    def _detect_energy(self, original: str, lower: str, upper_count: int) -> str:
+        """
+        Detect energy level (high/medium/low).
+        
+        Args:
+            original: Original message
+            lower: Lowercased message
+            upper_count: Number of uppercase characters in the original message
+        """
+        length = len(original)
+        counts = self._tally(lower, self._energy_rx)
+        high_score = counts["high"]
+        low_score = counts["low"]
         
         # Check for caps
-        if sum(1 for c in original if c.isupper()) > len(original) * 0.3:
+        if upper_count > length * 0.3:
             high_score += 2
         
         # Check message length and punctuation
-        if len(original) > 200:
+        if length > 200:
             high_score += 1
         
         if high_score > low_score:
@@ -185,8 +308,9 @@ class ToneDetector:
     
     def _detect_formality(self, text: str) -> str:
         """Detect formality level (casual/neutral/formal)."""
-        formal_score = self._count_matches(text, self.formal_patterns)
-        casual_score = self._count_matches(text, self.casual_patterns)
+        counts = self._tally(text, self._formality_rx, self._formality_any)
+        formal_score = counts["formal"]
+        casual_score = counts["casual"]
         
         if formal_score > casual_score and formal_score > 0:
             return "formal"
@@ -195,7 +319,7 @@ class ToneDetector:
         else:
             return "neutral"
     
-    def get_response_guidance(self, tone: EmotionalTone) -> dict:
+    def get_response_guidance(self, tone: EmotionalTone) -> Mapping[str, Any]:
         """
         Get guidance for crafting appropriate response.
         
@@ -203,47 +327,9 @@ class ToneDetector:
             tone: Detected EmotionalTone
             
         Returns:
-            Dictionary with response guidance
+            Read-only mapping with response guidance
         """
-        guidance = {
-            "sad": {
-                "style": "empathetic, soft, supportive",
-                "avoid": ["toxic positivity", "dismissing feelings", "overexplaining"],
-                "include": ["validation", "presence", "gentle support"]
-            },
-            "excited": {
-                "style": "enthusiastic, energetic, celebratory",
-                "avoid": ["dampening energy", "being too serious"],
-                "include": ["exclamation points", "matching excitement", "follow-up questions"]
-            },
-            "angry": {
-                "style": "calm, validating, space-giving",
-                "avoid": ["dismissing anger", "taking it personally", "being defensive"],
-                "include": ["acknowledgment", "empathy", "patience"]
-            },
-            "anxious": {
-                "style": "reassuring, grounding, patient",
-                "avoid": ["minimizing concerns", "rushing", "adding pressure"],
-                "include": ["calm presence", "practical support", "validation"]
-            },
-            "sarcastic": {
-                "style": "playful, witty, banter-ready",
-                "avoid": ["taking too seriously", "being overly sincere"],
-                "include": ["light humor", "playful responses", "matching wit"]
-            },
-            "happy": {
-                "style": "warm, positive, engaged",
-                "avoid": ["dampening mood", "being cynical"],
-                "include": ["genuine interest", "positive energy", "celebration"]
-            },
-            "casual": {
-                "style": "relaxed, conversational, natural",
-                "avoid": ["being too formal", "overthinking"],
-                "include": ["casual language", "easy flow", "authenticity"]
-            }
-        }
-        
-        return guidance.get(tone.primary, guidance["casual"])
+        return self._GUIDANCE.get(tone.primary, self._GUIDANCE[_CASUAL])
     
     def should_adapt_tone(self, current_tone: str, detected_tone: str) -> bool:
         """
@@ -257,13 +343,11 @@ class ToneDetector:
             True if should adapt
         """
         # Always adapt to strong emotional signals
-        strong_signals = ["sad", "angry", "anxious", "excited"]
-        
-        if detected_tone in strong_signals:
+        if detected_tone in _STRONG_SIGNALS:
             return True
         
         # Don't shift too quickly for neutral tones
-        if detected_tone == "casual" and current_tone in strong_signals:
+        if detected_tone == _CASUAL and current_tone in _STRONG_SIGNALS:
             return False
         
         return current_tone != detected_tone
@@ -10,7 +10,9 @@ Coordinates:
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any
+import re
+import time
+from typing import AsyncIterator, Dict, List, Optional, Any
 from dataclasses import dataclass
 
 from .persona_manager import PersonaManager
@@ -20,11 +22,27 @@ from ..memory.redis_backend import RedisBackend
 from ..conversation.tone_detector import ToneDetector
 from ..conversation.context_builder import ContextBuilder
 from ..conversation.summarizer import ConversationSummarizer
-from ..integration.gemini_client import GeminiClient
+from ..integration.gemini_client import GeminiClient, BatchingGeminiClient
 from ..integration.prompt_builder import PromptBuilder
 
 
-@dataclass
+# All interest phrasings fused into one alternation, scanned once per message
+_INTEREST_PHRASES = ("love", "like", "enjoy", "into", "fan of", "interested in", "hobby is")
+_INTEREST_PATTERN = re.compile(
+    r"(?:{})\s+([\w\s]+)".format("|".join(map(re.escape, _INTEREST_PHRASES)))
+)
+
+# Safe replies used when a generated response fails validation, by tone
+_FALLBACKS: Dict[Optional[str], str] = {
+    "sad": "I'm here for you. Wanna talk about it?",
+    "excited": "That's awesome! Tell me more!",
+    "angry": "I hear you. That sounds frustrating.",
+    "anxious": "Hey, it's okay. Take a breath. What's going on?",
+    None: "Hmm, let me think about that differently..."
+}
+
+
+@dataclass(slots=True)
 class ChatResponse:
     """Response from chatbot with metadata."""
     
@@ -66,7 +84,8 @@ class ChatbotEngine:
         gemini_api_key: Optional[str] = None,
         model: str = "gemini-2.0-flash-exp",
         enable_safety: bool = True,
-        enable_tone_adaptation: bool = True
+        enable_tone_adaptation: bool = True,
+        enable_batching: bool = False
     ):
         """
         Initialize chatbot engine.
@@ -78,6 +97,7 @@ class ChatbotEngine:
             model: Gemini model name
             enable_safety: Enable safety validation
             enable_tone_adaptation: Enable tone adaptation
+            enable_batching: Coalesce concurrent Gemini requests into micro-batches
         """
         # Initialize components
         self.persona_manager = PersonaManager(persona_config_path)
@@ -98,6 +118,8 @@ class ChatbotEngine:
             temperature=0.9,  # High for natural variation
             max_tokens=500
         )
+        if enable_batching:
+            self.gemini_client = BatchingGeminiClient(self.gemini_client)
         
         # Settings
         self.enable_safety = enable_safety
@@ -106,6 +128,13 @@ class ChatbotEngine:
         # Stats
         self.total_conversations = 0
         self.total_tokens = 0
+        
+        # Background persistence tasks (kept referenced until they finish)
+        self._bg_tasks = set()
+        self._pending_persist: Dict[str, asyncio.Task] = {}
+        
+        # Last health check result as (monotonic time, checks)
+        self._last_health: Optional[tuple] = None
     
     async def chat(
         self,
@@ -126,115 +155,36 @@ class ChatbotEngine:
         Returns:
             ChatResponse object
         """
-        import time
         start_time = time.time()
         
         try:
-            # Validate input
-            is_valid, error = self.gemini_client.validate_input(message)
-            if not is_valid:
-                return ChatResponse(
-                    text="Hey, could you rephrase that?",
-                    user_id=user_id,
-                    session_id=session_id,
-                    safety_passed=False,
-                    metadata={"error": error}
-                )
+            # Lowercased once and shared by every per-turn analyzer
+            message_lower = message.lower()
             
-            # Check if asking if bot
-            if self.persona_manager.should_deflect_bot_question(message):
-                deflection = self.persona_manager.get_bot_deflection()
-                return ChatResponse(
-                    text=deflection,
-                    user_id=user_id,
-                    session_id=session_id,
-                    detected_tone="curious",
-                    confidence=1.0
-                )
-            
-            # Detect tone
-            detected_tone = None
-            if self.enable_tone_adaptation:
-                tone = self.tone_detector.detect(message)
-                detected_tone = tone.primary
-            
-            # Load memory context
-            context = await self.memory_manager.build_context_for_llm(
-                user_id, session_id
-            )
-            
-            # Get session and add user message
-            session = await self.memory_manager.get_session_context(session_id, user_id)
-            session.add_exchange("user", message, {"tone": detected_tone})
-            await self.memory_manager.save_session_context(session)
+            early = self._early_response(user_id, message, session_id, message_lower)
+            if early:
+                return early
             
-            # Build system prompt
-            system_prompt = self.persona_manager.get_system_prompt(
-                user_context=context.get("user_profile")
-            )
-            
-            # Add tone adaptation if enabled
-            if self.enable_tone_adaptation and detected_tone:
-                tone_guidance = self.tone_detector.get_response_guidance(tone)
-                system_prompt = self.prompt_builder.build_tone_specific_prompt(
-                    system_prompt,
-                    detected_tone,
-                    tone.energy_level
-                )
-            
-            # Build context string
-            user_context = self.context_builder.build_context(
-                user_profile=context.get("user_profile", {}),
-                conversation_history=session.get_conversation_history(),
-                recent_summaries=context.get("recent_summaries", []),
-                current_mood=session.current_mood,
-                current_topic=session.current_topic
-            )
+            detected_tone, context, session, history, system_prompt, user_context = \
+                await self._prepare_turn(user_id, message, session_id, message_lower)
             
             # Generate response
             response = await self.gemini_client.generate_response(
                 system_prompt=system_prompt,
-                conversation_history=session.get_conversation_history(),
+                conversation_history=history,
                 context=user_context
             )
             
-            response_text = response.get("text", "")
+            response_text = self._finalize_text(
+                response.get("text", ""), context, history, detected_tone
+            )
             tokens_used = response.get("usage", {}).get("total_tokens", 0)
             
-            # Safety validation
-            if self.enable_safety:
-                is_safe, error_type, error_msg = self.safety_layer.validate_response(
-                    response_text,
-                    context,
-                    session.get_conversation_history()
-                )
-                
-                if not is_safe:
-                    # Regenerate or use fallback
-                    response_text = self._get_safe_fallback(detected_tone)
-            
-            # Validate against persona
-            is_valid, error = self.persona_manager.validate_response(response_text)
-            if not is_valid:
-                # Sanitize response
-                response_text = self.safety_layer.sanitize_response(response_text)
-            
-            # Save bot response to session
-            session.add_exchange("assistant", response_text)
-            if detected_tone:
-                session.update_mood(detected_tone)
-            await self.memory_manager.save_session_context(session)
-            
-            # Extract and update user profile
-            extracted_info = self._extract_user_info(message)
-            if extracted_info:
-                await self.memory_manager.extract_and_update_profile(
-                    user_id, message, extracted_info
-                )
-            
-            # Check if should summarize
-            if self.summarizer.should_summarize(len(session.recent_exchanges)):
-                await self._summarize_and_compress(user_id, session_id, session)
+            # Persist off the response path
+            self._persist_in_background(session_id, self._post_turn_persist(
+                user_id, session_id, message, session, response_text, detected_tone,
+                message_lower
+            ))
             
             # Update stats
             self.total_conversations += 1
@@ -265,6 +215,298 @@ class ChatbotEngine:
                 metadata={"error": str(e)}
             )
     
+    async def chat_stream(
+        self,
+        user_id: str,
+        message: str,
+        session_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a user message and stream the response as it is generated.
+        
+        Yields {"text": chunk, "done": False} for each generated chunk and
+        finishes with {"text": "", "done": True, "response": ChatResponse}.
+        Safety and persona validation run on the complete text; if they
+        replace it, the final response carries the replacement text.
+        Saving the turn happens in the background after the stream ends.
+        
+        Args:
+            user_id: Unique user identifier
+            message: User's message
+            session_id: Session identifier
+            metadata: Optional metadata
+            
+        Yields:
+            Response chunks, then the final ChatResponse
+        """
+        start_time = time.time()
+        
+        try:
+            # Lowercased once and shared by every per-turn analyzer
+            message_lower = message.lower()
+            
+            early = self._early_response(user_id, message, session_id, message_lower)
+            if early:
+                yield {"text": early.text, "done": False}
+                yield {"text": "", "done": True, "response": early}
+                return
+            
+            detected_tone, context, session, history, system_prompt, user_context = \
+                await self._prepare_turn(user_id, message, session_id, message_lower)
+            
+            chunks = []
+            usage = {}
+            async for chunk in self.gemini_client.generate_response_streaming(
+                system_prompt=system_prompt,
+                conversation_history=history,
+                context=user_context
+            ):
+                if chunk["text"]:
+                    chunks.append(chunk["text"])
+                    yield {"text": chunk["text"], "done": False}
+                if chunk["done"]:
+                    usage = chunk.get("usage", {})
+            
+            response_text = self._finalize_text(
+                "".join(chunks).strip(), context, history, detected_tone
+            )
+            tokens_used = usage.get("total_tokens", 0)
+            
+            # Persist off the response path
+            self._persist_in_background(session_id, self._post_turn_persist(
+                user_id, session_id, message, session, response_text, detected_tone,
+                message_lower
+            ))
+            
+            # Update stats
+            self.total_conversations += 1
+            self.total_tokens += tokens_used
+            
+            yield {
+                "text": "",
+                "done": True,
+                "response": ChatResponse(
+                    text=response_text,
+                    user_id=user_id,
+                    session_id=session_id,
+                    detected_tone=detected_tone,
+                    confidence=0.9,
+                    tokens_used=tokens_used,
+                    response_time_ms=(time.time() - start_time) * 1000,
+                    safety_passed=True,
+                    metadata=metadata
+                )
+            }
+            
+        except Exception as e:
+            print(f"Error in chat stream: {e}")
+            yield {
+                "text": "",
+                "done": True,
+                "response": ChatResponse(
+                    text="Oops, something went wrong on my end. Can you try again?",
+                    user_id=user_id,
+                    session_id=session_id,
+                    safety_passed=False,
+                    metadata={"error": str(e)}
+                )
+            }
+    
+    def _early_response(
+        self,
+        user_id: str,
+        message: str,
+        session_id: str,
+        message_lower: Optional[str] = None
+    ) -> Optional[ChatResponse]:
+        """Answer invalid input and bot questions without calling the LLM."""
+        # Validate input
+        is_valid, error = self.gemini_client.validate_input(message)
+        if not is_valid:
+            return ChatResponse(
+                text="Hey, could you rephrase that?",
+                user_id=user_id,
+                session_id=session_id,
+                safety_passed=False,
+                metadata={"error": error}
+            )
+        
+        # Check if asking if bot
+        if self.persona_manager.should_deflect_bot_question(message, message_lower):
+            deflection = self.persona_manager.get_bot_deflection()
+            return ChatResponse(
+                text=deflection,
+                user_id=user_id,
+                session_id=session_id,
+                detected_tone="curious",
+                confidence=1.0
+            )
+        
+        return None
+    
+    async def _prepare_turn(
+        self,
+        user_id: str,
+        message: str,
+        session_id: str,
+        message_lower: Optional[str] = None
+    ):
+        """
+        Load memory, record the user message and build the prompts for a turn.
+        
+        Returns:
+            Tuple of (detected_tone, context, session, history, system_prompt,
+            user_context); history is the session's conversation history,
+            built once and shared by everything that reads it this turn
+        """
+        # Detect tone
+        detected_tone = None
+        if self.enable_tone_adaptation:
+            tone = self.tone_detector.detect(message, message_lower)
+            detected_tone = tone.primary
+        
+        # Let the previous turn of this session finish saving first
+        pending = self._pending_persist.get(session_id)
+        if pending:
+            await asyncio.wait([pending])
+        
+        # Load memory context and session concurrently (independent keys)
+        context, session = await asyncio.gather(
+            self.memory_manager.build_context_for_llm(user_id, session_id),
+            self.memory_manager.get_session_context(session_id, user_id)
+        )
+        
+        # Add user message to session; the save overlaps prompt building
+        # and generation instead of delaying them
+        session.add_exchange("user", message, {"tone": detected_tone})
+        self._persist_in_background(
+            session_id, self.memory_manager.save_session_context(session)
+        )
+        
+        # Build system prompt
+        system_prompt = self.persona_manager.get_system_prompt(
+            user_context=context.get("user_profile")
+        )
+        
+        # Add tone adaptation if enabled
+        if self.enable_tone_adaptation and detected_tone:
+            system_prompt = self.prompt_builder.build_tone_specific_prompt(
+                system_prompt,
+                detected_tone,
+                tone.energy_level
+            )
+        
+        history = session.get_conversation_history()
+        
+        # Build context string
+        user_context = self.context_builder.build_context(
+            user_profile=context.get("user_profile", {}),
+            conversation_history=history,
+            recent_summaries=context.get("recent_summaries", []),
+            current_mood=session.current_mood,
+            current_topic=session.current_topic
+        )
+        
+        return detected_tone, context, session, history, system_prompt, user_context
+    
+    def _finalize_text(
+        self,
+        response_text: str,
+        context: Dict[str, Any],
+        history: List[Dict[str, str]],
+        detected_tone: Optional[str]
+    ) -> str:
+        """Apply safety and persona validation to a generated response."""
+        # Safety validation
+        if self.enable_safety:
+            is_safe, error_type, error_msg = self.safety_layer.validate_response(
+                response_text,
+                context,
+                history
+            )
+            
+            if not is_safe:
+                # Regenerate or use fallback
+                response_text = self._get_safe_fallback(detected_tone)
+        
+        # Validate against persona
+        is_valid, error = self.persona_manager.validate_response(response_text)
+        if not is_valid:
+            # Sanitize response
+            response_text = self.safety_layer.sanitize_response(response_text)
+        
+        return response_text
+    
+    def _persist_in_background(self, session_id: str, coro):
+        """
+        Run a persistence coroutine as a tracked background task.
+        
+        Tasks for the same session run one after another, so a later save
+        can never be overwritten by an earlier one.
+        """
+        previous = self._pending_persist.get(session_id)
+        task = asyncio.create_task(self._persist_after(previous, coro))
+        self._bg_tasks.add(task)
+        self._pending_persist[session_id] = task
+        task.add_done_callback(self._bg_tasks.discard)
+        task.add_done_callback(lambda t: self._persist_done(session_id, t))
+    
+    @staticmethod
+    async def _persist_after(previous: Optional[asyncio.Task], coro):
+        """Await coro once the session's previous persistence task is done."""
+        if previous:
+            await asyncio.wait([previous])
+        await coro
+    
+    def _persist_done(self, session_id: str, task: asyncio.Task):
+        """Forget a finished persistence task and report its failure."""
+        if self._pending_persist.get(session_id) is task:
+            del self._pending_persist[session_id]
+        if not task.cancelled() and task.exception():
+            print(f"Error saving turn for session {session_id}: {task.exception()}")
+    
+    async def flush(self):
+        """Wait until all background persistence has finished."""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+    
+    async def shutdown(self):
+        """Finish background persistence and release clients before exiting."""
+        await self.flush()
+        
+        close = getattr(self.gemini_client, "close", None)
+        if close:
+            await close()
+    
+    async def _post_turn_persist(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        session,
+        response_text: str,
+        detected_tone: Optional[str],
+        message_lower: Optional[str] = None
+    ):
+        """Save the bot response, update the profile and summarize if due."""
+        # Save bot response to session
+        session.add_exchange("assistant", response_text)
+        if detected_tone:
+            session.update_mood(detected_tone)
+        await self.memory_manager.save_session_context(session)
+        
+        # Extract and update user profile
+        extracted_info = self._extract_user_info(message, message_lower)
+        if extracted_info:
+            await self.memory_manager.extract_and_update_profile(
+                user_id, message, extracted_info
+            )
+        
+        # Check if should summarize
+        if self.summarizer.should_summarize(len(session.recent_exchanges)):
+            await self._summarize_and_compress(user_id, session_id, session)
+    
     async def start_conversation(
         self,
         user_id: str,
@@ -280,19 +522,16 @@ class ChatbotEngine:
         Returns:
             ChatResponse with greeting
         """
-        # Get user profile
-        profile = await self.memory_manager.get_user_profile(user_id)
-        
-        # Determine if returning user
-        is_returning = profile.interaction_count > 0
+        # Determine if returning user (one counter increment, no profile load)
+        is_returning = await self.memory_manager.record_session_start(user_id)
         
         # Get appropriate opener
         greeting = self.persona_manager.get_conversation_opener(is_returning)
         
-        # Create session
-        session = await self.memory_manager.get_session_context(session_id, user_id)
-        session.add_exchange("assistant", greeting)
-        await self.memory_manager.save_session_context(session)
+        # Create session off the response path
+        self._persist_in_background(
+            session_id, self._save_greeting(user_id, session_id, greeting)
+        )
         
         return ChatResponse(
             text=greeting,
@@ -302,8 +541,29 @@ class ChatbotEngine:
             confidence=1.0
         )
     
-    def _extract_user_info(self, message: str) -> Dict[str, List[str]]:
+    async def _save_greeting(self, user_id: str, session_id: str, greeting: str):
+        """Record the opening greeting in the session."""
+        session = await self.memory_manager.get_session_context(session_id, user_id)
+        session.add_exchange("assistant", greeting)
+        await self.memory_manager.save_session_context(session)
+    
+    def _extract_user_info(
+        self,
+        message: str,
+        message_lower: Optional[str] = None
+    ) -> Dict[str, List[str]]:
         """Extract user information from message."""
+        if message_lower is None:
+            message_lower = message.lower()
+        
+        # Most messages mention none of the phrases; plain substring checks
+        # rule that out faster than running the regex
+        for phrase in _INTEREST_PHRASES:
+            if phrase in message_lower:
+                break
+        else:
+            return {}
+        
         extracted = {
             "interests": [],
             "likes": [],
@@ -311,43 +571,17 @@ class ChatbotEngine:
             "personality_notes": []
         }
         
-        message_lower = message.lower()
-        
-        # Extract name
-        name_patterns = [
-            r"(i'm|i am|my name is|call me) ([A-Z][a-z]+)",
-            r"this is ([A-Z][a-z]+)"
-        ]
-        
         # Extract interests
-        interest_patterns = [
-            r"(love|like|enjoy|into|fan of) ([\w\s]+)",
-            r"interested in ([\w\s]+)",
-            r"hobby is ([\w\s]+)"
-        ]
-        
-        for pattern in interest_patterns:
-            import re
-            matches = re.findall(pattern, message_lower)
-            for match in matches:
-                if isinstance(match, tuple):
-                    interest = match[1].strip()
-                    if len(interest) < 50:  # Reasonable length
-                        extracted["interests"].append(interest)
+        for match in _INTEREST_PATTERN.findall(message_lower):
+            interest = match.strip()
+            if len(interest) < 50:  # Reasonable length
+                extracted["interests"].append(interest)
         
         return extracted if any(extracted.values()) else {}
     
     def _get_safe_fallback(self, tone: Optional[str] = None) -> str:
         """Get a safe fallback response."""
-        fallbacks = {
-            "sad": "I'm here for you. Wanna talk about it?",
-            "excited": "That's awesome! Tell me more!",
-            "angry": "I hear you. That sounds frustrating.",
-            "anxious": "Hey, it's okay. Take a breath. What's going on?",
-            None: "Hmm, let me think about that differently..."
-        }
-        
-        return fallbacks.get(tone, fallbacks[None])
+        return _FALLBACKS.get(tone, _FALLBACKS[None])
     
     async def _summarize_and_compress(
         self,
@@ -356,8 +590,12 @@ class ChatbotEngine:
         session
     ):
         """Summarize conversation and compress session."""
-        summary_data = self.summarizer.summarize_conversation(
-            session.recent_exchanges,
+        # Summarize a snapshot in a worker thread so the event loop stays
+        # free; the history copy is also in the role/content shape the
+        # summarizer reads
+        summary_data = await asyncio.to_thread(
+            self.summarizer.summarize_conversation,
+            session.get_conversation_history(),
             extract_key_moments=True
         )
         
@@ -378,13 +616,15 @@ class ChatbotEngine:
         await self.memory_manager.save_conversation_summary(summary)
         
         # Compress session (keep only recent exchanges)
-        session.recent_exchanges = session.recent_exchanges[-4:]
+        session.keep_recent(4)
         await self.memory_manager.save_session_context(session)
     
     async def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         """Get statistics for a user."""
-        profile = await self.memory_manager.get_user_profile(user_id)
-        summaries = await self.memory_manager.get_conversation_summaries(user_id)
+        profile, summaries = await asyncio.gather(
+            self.memory_manager.get_user_profile(user_id),
+            self.memory_manager.get_conversation_summaries(user_id)
+        )
         
         return {
             "user_id": user_id,
@@ -392,7 +632,7 @@ class ChatbotEngine:
             "interaction_count": profile.interaction_count,
             "first_seen": profile.first_seen,
             "last_seen": profile.last_seen,
-            "interests": profile.preferences.get("interests", []),
+            "interests": profile.interests,
             "past_conversations": len(summaries)
         }
     
@@ -413,8 +653,22 @@ class ChatbotEngine:
             "tone_adaptation_enabled": self.enable_tone_adaptation
         }
     
-    async def health_check(self) -> Dict[str, bool]:
-        """Check health of all components."""
+    async def health_check(self, max_age: float = 0.0) -> Dict[str, bool]:
+        """
+        Check health of all components.
+        
+        Args:
+            max_age: Reuse the previous result if it is at most this many
+                seconds old (0 always runs the checks)
+            
+        Returns:
+            Health status per component and overall
+        """
+        if self._last_health and max_age > 0:
+            checked_at, checks = self._last_health
+            if time.monotonic() - checked_at <= max_age:
+                return dict(checks)
+        
         checks = {
             "gemini_api": False,
             "redis": False,
@@ -422,24 +676,28 @@ class ChatbotEngine:
             "overall": False
         }
         
-        try:
-            # Test Gemini
-            checks["gemini_api"] = await self.gemini_client.test_connection()
-            
-            # Test Redis
-            checks["redis"] = await self.memory_manager.backend.ping()
-            
-            # Overall health
-            checks["overall"] = all([
-                checks["gemini_api"],
-                checks["redis"],
-                checks["persona"]
-            ])
-            
-        except Exception as e:
-            print(f"Health check error: {e}")
+        # Test Gemini and Redis concurrently; one failing doesn't mask the other
+        results = await asyncio.gather(
+            self.gemini_client.test_connection(),
+            self.memory_manager.backend.ping(),
+            return_exceptions=True
+        )
+        
+        for name, result in zip(("gemini_api", "redis"), results):
+            if isinstance(result, Exception):
+                print(f"Health check error ({name}): {result}")
+            else:
+                checks[name] = bool(result)
+        
+        # Overall health
+        checks["overall"] = all([
+            checks["gemini_api"],
+            checks["redis"],
+            checks["persona"]
+        ])
         
-        return checks
+        self._last_health = (time.monotonic(), checks)
+        return dict(checks)
     
     def __repr__(self) -> str:
         return f"ChatbotEngine(persona={self.persona_manager.name})"
@@ -6,11 +6,36 @@ consistency across all conversations.
 """
 
 import random
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 import yaml
 from pathlib import Path
 
 
+# Per-turn keyword scans, built once instead of on every call. Plain
+# substring loops over these beat a fused regex on chat-sized strings.
+_AI_KEYWORDS = ("ai", "artificial intelligence", "language model", "llm",
+                "openai", "api", "system", "trained on")
+_ROBOTIC_PATTERNS = (
+    "according to my",
+    "as an ai",
+    "i don't have personal",
+    "i'm programmed to",
+    "my training data",
+    "retrieving from memory",
+    "based on our previous conversation on"
+)
+_BOT_QUESTIONS = (
+    "are you a bot",
+    "are you ai",
+    "are you real",
+    "are you human",
+    "are you artificial",
+    "are you a robot",
+    "what are you"
+)
+
+
 class PersonaManager:
     """
     Manages the chatbot's persona, ensuring consistency and character adherence.
@@ -36,6 +61,16 @@ class PersonaManager:
         # Track recent responses to avoid repetition
         self.recent_patterns = []
         self.max_pattern_memory = 10
+        
+        # Opener options are fixed by the config; pick from them per session
+        openers = self.config.get("conversation_flow", {}).get("opening_messages", {})
+        self._openers = {
+            True: tuple(openers.get("returning", ["Hey! How's it going?"])),
+            False: tuple(openers.get("first_time", ["Hey! What's up?"])),
+        }
+        
+        # Rendered prompts keyed by the only profile fields they use
+        self._system_prompt_cached = lru_cache(maxsize=1024)(self._render_system_prompt)
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load persona configuration from YAML file."""
@@ -55,6 +90,16 @@ class PersonaManager:
         Returns:
             System prompt string for the LLM
         """
+        user_name = None
+        topics = ()
+        if user_context:
+            user_name = user_context.get("name")
+            topics = tuple((user_context.get("recent_topics") or ())[:3])
+        
+        return self._system_prompt_cached(user_name, topics)
+    
+    def _render_system_prompt(self, user_name: Optional[str], topics: tuple) -> str:
+        """Render the system prompt for a user name and recent topics."""
         core_traits = ", ".join(self.personality.get("core_traits", []))
         boundaries = "\n".join([f"- {b}" for b in self.personality.get("boundaries", [])])
         interests = ", ".join(self.backstory.get("interests", []))
@@ -98,15 +143,12 @@ EMOTIONAL INTELLIGENCE:
 You're having a genuine conversation with a real person. Be present, authentic, and human."""
 
         # Add user-specific context if available
-        if user_context:
-            user_name = user_context.get("name")
-            if user_name:
-                prompt += f"\n\nYou're currently talking with {user_name}."
-            
-            # Add relevant memory snippets
-            if user_context.get("recent_topics"):
-                topics = ", ".join(user_context["recent_topics"][:3])
-                prompt += f"\nRecent conversation topics: {topics}"
+        if user_name:
+            prompt += f"\n\nYou're currently talking with {user_name}."
+        
+        # Add relevant memory snippets
+        if topics:
+            prompt += f"\nRecent conversation topics: {', '.join(topics)}"
         
         return prompt
     
@@ -188,26 +230,14 @@ You're having a genuine conversation with a real person. Be present, authentic,
         never_rules = self.safety_rules.get("never", [])
         
         # Check for explicit AI mentions
-        ai_keywords = ["ai", "artificial intelligence", "language model", "llm", 
-                       "openai", "api", "system", "trained on"]
         response_lower = response.lower()
         
-        for keyword in ai_keywords:
+        for keyword in _AI_KEYWORDS:
             if keyword in response_lower:
                 return False, f"Response contains forbidden keyword: {keyword}"
         
         # Check for robotic patterns
-        robotic_patterns = [
-            "according to my",
-            "as an ai",
-            "i don't have personal",
-            "i'm programmed to",
-            "my training data",
-            "retrieving from memory",
-            "based on our previous conversation on"
-        ]
-        
-        for pattern in robotic_patterns:
+        for pattern in _ROBOTIC_PATTERNS:
             if pattern in response_lower:
                 return False, f"Response contains robotic pattern: {pattern}"
         
@@ -223,38 +253,25 @@ You're having a genuine conversation with a real person. Be present, authentic,
         Returns:
             Opening message string
         """
-        flow = self.config.get("conversation_flow", {})
-        openers = flow.get("opening_messages", {})
-        
-        if is_returning_user:
-            options = openers.get("returning", ["Hey! How's it going?"])
-        else:
-            options = openers.get("first_time", ["Hey! What's up?"])
-        
-        return random.choice(options)
+        return random.choice(self._openers[bool(is_returning_user)])
     
-    def should_deflect_bot_question(self, message: str) -> bool:
+    def should_deflect_bot_question(self, message: str, message_lower: Optional[str] = None) -> bool:
         """
         Check if message is asking if chatbot is a bot.
         
         Args:
             message: User message
+            message_lower: message.lower(), if the caller already has it
             
         Returns:
             True if should deflect
         """
-        bot_keywords = [
-            "are you a bot",
-            "are you ai",
-            "are you real",
-            "are you human",
-            "are you artificial",
-            "are you a robot",
-            "what are you"
-        ]
-        
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in bot_keywords)
+        if message_lower is None:
+            message_lower = message.lower()
+        for keyword in _BOT_QUESTIONS:
+            if keyword in message_lower:
+                return True
+        return False
     
     def get_bot_deflection(self) -> str:
         """
@@ -12,6 +12,11 @@ import asyncio
 import os
 from chatbot_system import ChatbotEngine
 
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
 
 async def main():
     """Run a basic conversation example."""
@@ -78,6 +83,9 @@ async def main():
         # Small delay for natural feel
         await asyncio.sleep(1)
     
+    # Make sure every turn has been saved before reading stats
+    await bot.flush()
+    
     # Get user stats
     print("\n" + "="*50)
     print("USER STATISTICS")
@@ -101,5 +109,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     asyncio.run(main())
 
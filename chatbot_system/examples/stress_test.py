@@ -15,6 +15,11 @@ from chatbot_system import ChatbotEngine
 import uuid
 import random
 
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
 
 async def simulate_user(bot, user_id, message_count=5):
     """Simulate a single user's conversation."""
@@ -92,6 +97,9 @@ async def run_stress_test(num_users=50, messages_per_user=5):
     
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
+    # Include background persistence in the measured time
+    await bot.flush()
+    
     end_time = time.time()
     total_duration = end_time - start_time
     
@@ -124,6 +132,9 @@ async def run_stress_test(num_users=50, messages_per_user=5):
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     # Start with smaller number for testing
     asyncio.run(run_stress_test(num_users=10, messages_per_user=3))
     
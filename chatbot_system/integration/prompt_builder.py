@@ -9,6 +9,7 @@ Combines:
 - Safety instructions
 """
 
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 
 
@@ -25,6 +26,9 @@ class PromptBuilder:
             max_prompt_tokens: Maximum tokens for entire prompt
         """
         self.max_prompt_tokens = max_prompt_tokens
+        
+        # The same base prompt recurs every turn; reuse the enhanced strings
+        self._tone_prompt_cached = lru_cache(maxsize=1024)(self._render_tone_specific_prompt)
     
     def build_complete_prompt(
         self,
@@ -269,6 +273,15 @@ SAFETY RULES (CRITICAL):
         Returns:
             Enhanced prompt
         """
+        return self._tone_prompt_cached(base_prompt, detected_tone, energy_level)
+    
+    def _render_tone_specific_prompt(
+        self,
+        base_prompt: str,
+        detected_tone: str,
+        energy_level: str
+    ) -> str:
+        """Render the tone-enhanced prompt without consulting the cache."""
         tone_guidance = {
             "sad": "Be empathetic and supportive. Use a gentle, caring tone. Avoid toxic positivity.",
             "excited": "Match their enthusiasm! Use exclamation points and share their excitement.",
@@ -8,10 +8,25 @@ Provides fast, scalable storage for:
 """
 
 import redis.asyncio as aioredis
-from typing import Optional, List
+from typing import Optional, List, Tuple, Union
 import os
 
 
+# Keys examined per SCAN call; the server default of 10 means one round
+# trip per handful of keys on a large keyspace
+_SCAN_COUNT = 1000
+
+# INCRBY, then an expiry if the counter has none; run as one script so a
+# crash or cancellation between the two can't leave a counter that never expires
+_INCREMENT_WITH_TTL = """
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if redis.call('TTL', KEYS[1]) == -1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return value
+"""
+
+
 class RedisBackend:
     """
     Redis storage backend for memory management.
@@ -19,33 +34,48 @@ class RedisBackend:
     Uses async Redis for non-blocking operations.
     """
     
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(self, redis_url: Optional[str] = None, max_connections: Optional[int] = None):
         """
         Initialize Redis backend.
         
         Args:
             redis_url: Redis connection URL (defaults to env var REDIS_URL)
+            max_connections: Connection pool size (defaults to env var
+                REDIS_MAX_CONNECTIONS, or 50)
         """
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.max_connections = max_connections or int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+        self.pool: Optional[aioredis.ConnectionPool] = None
         self.redis: Optional[aioredis.Redis] = None
+        self._increment_with_ttl = None
     
     async def connect(self):
-        """Establish connection to Redis."""
-        if not self.redis:
-            self.redis = await aioredis.from_url(
+        """
+        Establish connection to Redis.
+        
+        Commands call this only while self.redis is None, so a connected
+        backend skips the extra coroutine on every operation.
+        """
+        if self.redis is None:
+            # One bounded pool shared by every command (and pipeline).
+            # Replies stay raw bytes: stored values are JSON that orjson
+            # parses from bytes directly, so decoding to str is wasted work.
+            self.pool = aioredis.ConnectionPool.from_url(
                 self.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-                max_connections=50
+                max_connections=self.max_connections
             )
+            self.redis = aioredis.Redis(connection_pool=self.pool)
+            self._increment_with_ttl = self.redis.register_script(_INCREMENT_WITH_TTL)
     
     async def disconnect(self):
         """Close Redis connection."""
         if self.redis:
             await self.redis.close()
+            await self.pool.disconnect()
             self.redis = None
+            self.pool = None
     
-    async def get(self, key: str) -> Optional[str]:
+    async def get(self, key: str) -> Optional[bytes]:
         """
         Get value by key.
         
@@ -53,12 +83,52 @@ class RedisBackend:
             key: Storage key
             
         Returns:
-            Value string or None if not found
+            Value bytes or None if not found
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         return await self.redis.get(key)
     
-    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """
+        Get several values in one round trip.
+        
+        Args:
+            keys: Storage keys
+            
+        Returns:
+            Values in the same order as keys (None where not found)
+        """
+        if self.redis is None:
+            await self.connect()
+        return await self.redis.mget(keys)
+    
+    async def get_many_and_list(
+        self,
+        keys: List[str],
+        list_key: str,
+        limit: int = 10
+    ) -> Tuple[List[Optional[bytes]], List[bytes]]:
+        """
+        Get several values and the head of a list in one round trip.
+        
+        Args:
+            keys: Storage keys
+            list_key: List key
+            limit: Maximum number of list items to retrieve
+            
+        Returns:
+            Tuple of (values in the same order as keys, list items)
+        """
+        if self.redis is None:
+            await self.connect()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.mget(keys)
+            pipe.lrange(list_key, 0, limit - 1)
+            values, items = await pipe.execute()
+        return values, items
+    
+    async def set(self, key: str, value: Union[bytes, str], ttl: Optional[int] = None):
         """
         Set key-value pair with optional TTL.
         
@@ -67,7 +137,8 @@ class RedisBackend:
             value: Value to store
             ttl: Time-to-live in seconds (optional)
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         if ttl:
             await self.redis.setex(key, ttl, value)
         else:
@@ -80,7 +151,8 @@ class RedisBackend:
         Args:
             key: Storage key
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         await self.redis.delete(key)
     
     async def exists(self, key: str) -> bool:
@@ -93,10 +165,11 @@ class RedisBackend:
         Returns:
             True if exists, False otherwise
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         return await self.redis.exists(key) > 0
     
-    async def get_list(self, key: str, limit: int = 10) -> List[str]:
+    async def get_list(self, key: str, limit: int = 10) -> List[bytes]:
         """
         Get list of values (for conversation summaries).
         
@@ -107,11 +180,12 @@ class RedisBackend:
         Returns:
             List of values
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         items = await self.redis.lrange(key, 0, limit - 1)
         return items if items else []
     
-    async def add_to_list(self, key: str, value: str, max_length: Optional[int] = None):
+    async def add_to_list(self, key: str, value: Union[bytes, str], max_length: Optional[int] = None):
         """
         Add value to list (FIFO).
         
@@ -120,14 +194,39 @@ class RedisBackend:
             value: Value to add
             max_length: Maximum list length (oldest items removed if exceeded)
         """
-        await self.connect()
-        
-        # Add to front of list
-        await self.redis.lpush(key, value)
+        if self.redis is None:
+            await self.connect()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            # Add to front of list
+            pipe.lpush(key, value)
+            
+            # Trim if max_length specified
+            if max_length:
+                pipe.ltrim(key, 0, max_length - 1)
+            
+            await pipe.execute()
+    
+    async def add_to_lists(
+        self,
+        entries: List[Tuple[str, Union[bytes, str]]],
+        max_length: Optional[int] = None
+    ):
+        """
+        Add several values to lists in one round trip.
         
-        # Trim if max_length specified
-        if max_length:
-            await self.redis.ltrim(key, 0, max_length - 1)
+        Args:
+            entries: (list key, value) pairs, applied in order
+            max_length: Maximum list length (oldest items removed if exceeded)
+        """
+        if self.redis is None:
+            await self.connect()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in entries:
+                pipe.lpush(key, value)
+                if max_length:
+                    pipe.ltrim(key, 0, max_length - 1)
+            
+            await pipe.execute()
     
     async def get_hash(self, key: str) -> dict:
         """
@@ -137,9 +236,10 @@ class RedisBackend:
             key: Hash key
             
         Returns:
-            Dictionary of hash fields
+            Dictionary of hash fields (bytes keys and values)
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         return await self.redis.hgetall(key)
     
     async def set_hash(self, key: str, mapping: dict, ttl: Optional[int] = None):
@@ -151,24 +251,32 @@ class RedisBackend:
             mapping: Dictionary to store
             ttl: Time-to-live in seconds (optional)
         """
-        await self.connect()
-        await self.redis.hset(key, mapping=mapping)
-        
-        if ttl:
-            await self.redis.expire(key, ttl)
+        if self.redis is None:
+            await self.connect()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=mapping)
+            
+            if ttl:
+                pipe.expire(key, ttl)
+            
+            await pipe.execute()
     
-    async def increment(self, key: str, amount: int = 1) -> int:
+    async def increment(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
         """
         Increment a counter.
         
         Args:
             key: Counter key
             amount: Amount to increment by
+            ttl: Time-to-live in seconds, set if the counter has none (optional)
             
         Returns:
             New counter value
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
+        if ttl:
+            return await self._increment_with_ttl(keys=[key], args=[amount, ttl])
         return await self.redis.incrby(key, amount)
     
     async def get_keys_by_pattern(self, pattern: str) -> List[str]:
@@ -181,10 +289,11 @@ class RedisBackend:
         Returns:
             List of matching keys
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         keys = []
-        async for key in self.redis.scan_iter(match=pattern):
-            keys.append(key)
+        async for key in self.redis.scan_iter(match=pattern, count=_SCAN_COUNT):
+            keys.append(key.decode())
         return keys
     
     async def set_with_expiry(self, key: str, value: str, seconds: int):
@@ -196,7 +305,8 @@ class RedisBackend:
             value: Value to store
             seconds: Seconds until expiry
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         await self.redis.setex(key, seconds, value)
     
     async def get_ttl(self, key: str) -> int:
@@ -209,7 +319,8 @@ class RedisBackend:
         Returns:
             Remaining seconds (-1 if no TTL, -2 if key doesn't exist)
         """
-        await self.connect()
+        if self.redis is None:
+            await self.connect()
         return await self.redis.ttl(key)
     
     async def ping(self) -> bool:
@@ -220,7 +331,8 @@ class RedisBackend:
             True if connection is healthy
         """
         try:
-            await self.connect()
+            if self.redis is None:
+                await self.connect()
             return await self.redis.ping()
         except Exception:
             return False
@@ -21,6 +21,12 @@ def redis_url() -> str:
     return "redis://localhost:6379/1"
 
 
+@pytest.fixture
+def mongodb_uri() -> str:
+    """MongoDB URI for testing."""
+    return "mongodb://localhost:27017"
+
+
 @pytest.fixture
 def test_user_id() -> str:
     """Test user ID."""
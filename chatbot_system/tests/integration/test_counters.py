@@ -0,0 +1,114 @@
+"""
+Counter expiry tests for the storage backends.
+
+These need a live server and are skipped when none is reachable (see the
+redis_url and mongodb_uri fixtures).
+"""
+
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+import socket
+
+import pytest
+import pytest_asyncio
+
+from chatbot_system.memory.redis_backend import RedisBackend
+from chatbot_system.memory.mongodb_backend import MongoDBBackend
+
+
+COUNTER_KEY = "test_counter"
+
+
+@pytest_asyncio.fixture
+async def redis_backend(redis_url):
+    backend = RedisBackend(redis_url)
+    if not await backend.ping():
+        pytest.skip("Redis is not reachable")
+    await backend.delete(COUNTER_KEY)
+    yield backend
+    await backend.delete(COUNTER_KEY)
+    await backend.disconnect()
+
+
+def _listening(uri: str) -> bool:
+    """Quick TCP probe; the MongoDB client waits seconds before giving up."""
+    parsed = urlparse(uri)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port or 27017), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+@pytest_asyncio.fixture
+async def mongodb_backend(mongodb_uri):
+    backend = MongoDBBackend(mongodb_uri, db_name="chatbot_memory_test")
+    if not _listening(mongodb_uri) or not await backend.ping():
+        pytest.skip("MongoDB is not reachable")
+    await backend.db.memories.delete_many({"key": COUNTER_KEY})
+    yield backend
+    await backend.db.memories.delete_many({"key": COUNTER_KEY})
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_redis_counter_expires_from_creation(redis_backend):
+    """A new counter gets the TTL; later increments don't extend it."""
+    assert await redis_backend.increment(COUNTER_KEY, ttl=100) == 1
+    assert 0 < await redis_backend.redis.ttl(COUNTER_KEY) <= 100
+    
+    await redis_backend.redis.expire(COUNTER_KEY, 5)
+    assert await redis_backend.increment(COUNTER_KEY, ttl=100) == 2
+    assert await redis_backend.redis.ttl(COUNTER_KEY) <= 5
+
+
+@pytest.mark.asyncio
+async def test_redis_counter_without_expiry_gets_one(redis_backend):
+    """Counters created before the TTL existed pick it up on increment."""
+    await redis_backend.redis.set(COUNTER_KEY, 3)
+    
+    assert await redis_backend.increment(COUNTER_KEY, ttl=100) == 4
+    assert 0 < await redis_backend.redis.ttl(COUNTER_KEY) <= 100
+
+
+@pytest.mark.asyncio
+async def test_redis_counter_without_ttl_persists(redis_backend):
+    """Without a ttl the counter is a plain INCRBY."""
+    assert await redis_backend.increment(COUNTER_KEY, amount=2) == 2
+    assert await redis_backend.redis.ttl(COUNTER_KEY) == -1
+
+
+@pytest.mark.asyncio
+async def test_mongodb_counter_expires_from_creation(mongodb_backend):
+    """A new counter gets expires_at; later increments keep it."""
+    assert await mongodb_backend.increment(COUNTER_KEY, ttl=100) == 1
+    document = await mongodb_backend.db.memories.find_one({"key": COUNTER_KEY})
+    expires_at = document["expires_at"]
+    assert expires_at > datetime.utcnow()
+    
+    assert await mongodb_backend.increment(COUNTER_KEY, ttl=100) == 2
+    document = await mongodb_backend.db.memories.find_one({"key": COUNTER_KEY})
+    assert document["expires_at"] == expires_at
+
+
+@pytest.mark.asyncio
+async def test_mongodb_expired_counter_starts_over(mongodb_backend):
+    """An expired counter not yet removed by the TTL monitor resets."""
+    await mongodb_backend.db.memories.insert_one({
+        "key": COUNTER_KEY,
+        "counter": 5,
+        "expires_at": datetime.utcnow() - timedelta(seconds=1)
+    })
+    
+    assert await mongodb_backend.increment(COUNTER_KEY, ttl=100) == 1
+    document = await mongodb_backend.db.memories.find_one({"key": COUNTER_KEY})
+    assert document["expires_at"] > datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_mongodb_counter_without_ttl_persists(mongodb_backend):
+    """Without a ttl no expires_at is stored."""
+    assert await mongodb_backend.increment(COUNTER_KEY) == 1
+    assert await mongodb_backend.increment(COUNTER_KEY) == 2
+    document = await mongodb_backend.db.memories.find_one({"key": COUNTER_KEY})
+    assert "expires_at" not in document
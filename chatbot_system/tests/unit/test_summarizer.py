@@ -0,0 +1,154 @@
+"""
+Tests for ConversationSummarizer.
+"""
+
+import pytest
+from chatbot_system.conversation.summarizer import ConversationSummarizer
+
+
+def _exchanges(*messages):
+    """Alternate user/assistant exchanges from message texts."""
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": text}
+        for i, text in enumerate(messages)
+    ]
+
+
+@pytest.fixture
+def summarizer():
+    return ConversationSummarizer()
+
+
+def test_below_threshold_skips_analysis(summarizer, monkeypatch):
+    """Short conversations return the minimal result without any analysis."""
+    def fail(*args, **kwargs):
+        raise AssertionError("analysis ran below the summary threshold")
+    
+    for name in ("_extract_topics", "_segment_exchanges", "_extract_key_moments",
+                 "_detect_emotional_arc", "_generate_summary"):
+        monkeypatch.setattr(summarizer, name, fail)
+    
+    exchanges = _exchanges(*["I finally got the job, so happy!"] * 9)
+    
+    assert summarizer.summarize_conversation(exchanges) == {
+        "summary": "",
+        "key_moments": [],
+        "topics": [],
+        "emotional_arc": None,
+        "original_count": 9,
+        "tokens_saved": 0
+    }
+
+
+def test_threshold_is_configurable():
+    """summary_threshold moves the cut-off for the fast path."""
+    summarizer = ConversationSummarizer(summary_threshold=3)
+    exchanges = _exchanges("I love my job at work", "Nice!", "work is good")
+    
+    result = summarizer.summarize_conversation(exchanges)
+    
+    assert result["topics"] == ["work"]
+    assert result["original_count"] == 3
+
+
+def test_at_threshold_summarizes(summarizer):
+    """A conversation of exactly summary_threshold messages is summarized."""
+    exchanges = _exchanges(*["I love my job at work"] * 10)
+    
+    result = summarizer.summarize_conversation(exchanges)
+    
+    assert result["topics"] == ["work"]
+    assert result["summary"]
+
+
+def test_empty_conversation(summarizer):
+    """No exchanges gives an empty summary."""
+    assert summarizer.summarize_conversation([]) == {
+        "summary": "",
+        "key_moments": [],
+        "topics": [],
+        "emotional_arc": None
+    }
+
+
+# Three topic segments: work, family/health, hobby
+SEGMENTED = _exchanges(
+    "I finally told my boss about the project, I feel so happy!",
+    "That's great news!",
+    "work has been stressful but the job is good",
+    "Glad it's going well.",
+    "My mom is sick and I'm worried about my family",
+    "I'm sorry to hear that.",
+    "I realized my dad never calls, I feel sad",
+    "That sounds hard.",
+    "Anyway I've been gaming and listening to music, I love it!!",
+    "Nice!",
+    "I actually learned a new anime song, so excited!",
+    "Awesome!",
+)
+
+
+def test_segments_follow_topic_shifts(summarizer):
+    """Exchanges split where topic overlap drops; topicless ones stay put."""
+    segments = summarizer._segment_exchanges(SEGMENTED)
+    
+    assert [len(segment) for segment in segments] == [4, 4, 4]
+    assert segments[1][0]["content"].startswith("My mom is sick")
+    assert segments[2][0]["content"].startswith("Anyway I've been gaming")
+
+
+def test_emotional_arc_has_one_mood_per_segment(summarizer):
+    """The arc is guessed per segment, not from three sampled messages."""
+    result = summarizer.summarize_conversation(SEGMENTED)
+    
+    assert result["emotional_arc"] == "happy → sad → happy"
+
+
+def test_single_segment_arc_reports_its_mood(summarizer):
+    """One topic segment still yields an arc (the 3-point sample gave None)."""
+    exchanges = _exchanges(*["work is good", "Nice."] * 5)
+    
+    assert summarizer.summarize_conversation(exchanges)["emotional_arc"] == "happy"
+
+
+def test_key_moments_are_first_important_message_per_segment(summarizer):
+    """Each segment contributes at most one key moment."""
+    result = summarizer.summarize_conversation(SEGMENTED)
+    
+    assert result["key_moments"] == [
+        "I finally told my boss about the project, I feel so happy!",
+        "My mom is sick and I'm worried about my family",
+        "Anyway I've been gaming and listening to music, I love it!!",
+    ]
+    assert result["summary"] == (
+        "Discussed work, family, health and hobby. "
+        "I finally told my boss about the project, I feel so happy!"
+    )
+
+
+def test_key_moments_are_capped_at_five(summarizer):
+    """Conversations with many segments still keep five key moments."""
+    topics = ["my boss at work", "my mom and family", "my doctor and health",
+              "my college exam", "my music hobby", "my trip and flight"]
+    exchanges = _exchanges(*[
+        text
+        for topic in topics
+        for text in (f"I finally realized I love {topic}!", "Tell me more.")
+    ])
+    
+    assert len(summarizer.summarize_conversation(exchanges)["key_moments"]) == 5
+
+
+@pytest.mark.parametrize("exchanges", [
+    [],
+    _exchanges("hello"),
+    SEGMENTED,
+    _exchanges(*["abc"] * 20),
+])
+def test_tokens_saved_matches_joined_text_estimate(summarizer, exchanges):
+    """The summed-length estimate equals the one over the space-joined text."""
+    summary = "Discussed work."
+    joined = " ".join(ex.get("content", "") for ex in exchanges)
+    expected = max(0, len(joined) // 4 - len(summary) // 4)
+    
+    assert summarizer._estimate_tokens_saved(exchanges, summary) == expected
@@ -0,0 +1,54 @@
+"""
+Tests for ToneDetector scoring.
+"""
+
+import pytest
+from chatbot_system.conversation.tone_detector import ToneDetector
+
+
+@pytest.fixture
+def detector():
+    return ToneDetector()
+
+
+@pytest.mark.parametrize("message, primary, confidence", [
+    # The cross-span sarcasm pattern must not swallow the hits after it
+    ("sure i'm sad not happy", "sad", 0.3),
+    ("obviously I am so sad and lonely today, not fine", "sad", 0.6),
+    # Overlapping hits count in every category they match
+    ("I'm really happy and good", "happy", 0.6),
+    ("pretty good", "happy", 0.6),
+    ("Oh wow, that's just great. Totally what I wanted /s", "excited", 0.6),
+])
+def test_primary_tone_and_confidence(detector, message, primary, confidence):
+    """Primary tone and confidence match per-pattern counting."""
+    tone = detector.detect(message)
+    
+    assert tone.primary == primary
+    assert tone.confidence == pytest.approx(confidence)
+
+
+def test_secondary_tone_from_overlapping_pattern(detector):
+    """A span scored by a later category still shows up as the secondary tone."""
+    tone = detector.detect("sure i'm sad not happy")
+    
+    assert tone.secondary == "sarcastic"
+
+
+def test_casual_default(detector):
+    """Messages with no emotion hit default to casual."""
+    tone = detector.detect("What did you do today?")
+    
+    assert tone.primary == "casual"
+    assert tone.confidence == pytest.approx(0.5)
+    assert tone.secondary is None
+
+
+def test_long_message_matches_short_message_scoring(detector):
+    """Uncached (long) messages score the same way as cached short ones."""
+    short = "sure i'm sad not happy"
+    long = short + " " + "and that is all there is to say about it " * 3
+    
+    assert detector.detect(long).primary == detector.detect(short).primary
+    assert detector.detect(long).confidence == detector.detect(short).confidence
+
@@ -6,6 +6,12 @@ import asyncio
 import os
 import sys
 from pathlib import Path
+from typing import Optional
+
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
 
 # Add current directory to path for imports
 current_dir = Path(__file__).parent
@@ -18,13 +24,16 @@ load_dotenv()
 
 # Direct imports without package prefix
 import memory.mongodb_backend as mongodb_module
+import memory.redis_backend as redis_module
 import memory.memory_manager as memory_module
 import core.persona_manager as persona_module
 import conversation.tone_detector as tone_module
 import conversation.context_builder as context_module
 
 MongoDBBackend = mongodb_module.MongoDBBackend
+RedisBackend = redis_module.RedisBackend
 MemoryManager = memory_module.MemoryManager
+CachedMemoryManager = memory_module.CachedMemoryManager
 PersonaManager = persona_module.PersonaManager
 ToneDetector = tone_module.ToneDetector
 ContextBuilder = context_module.ContextBuilder
@@ -56,8 +65,13 @@ async def simulate_conversation():
     print("✅ MongoDB connected successfully!")
     print()
     
-    # Initialize components
-    memory_manager = MemoryManager(backend)
+    # Initialize components (optionally with a Redis read cache)
+    cache_url = os.getenv("REDIS_CACHE_URL")
+    if cache_url:
+        memory_manager = CachedMemoryManager(backend, RedisBackend(cache_url))
+        print("⚡ Redis read cache enabled")
+    else:
+        memory_manager = MemoryManager(backend)
     persona_manager = PersonaManager()
     tone_detector = ToneDetector()
     context_builder = ContextBuilder()
@@ -104,6 +118,7 @@ async def simulate_conversation():
         print("-" * 40)
         
         user_message = conv["user"]
+        message_lower = user_message.lower()
         print(f"👤 User: {user_message}")
         
         # Detect tone
@@ -117,16 +132,16 @@ async def simulate_conversation():
         
         # Extract info from message (simple keyword extraction for demo)
         extracted_info = {}
-        if "i'm" in user_message.lower() or "i am" in user_message.lower():
+        if "i'm" in message_lower or "i am" in message_lower:
             # Extract name
             words = user_message.split()
             for idx, word in enumerate(words):
                 if word.lower() in ["i'm", "i am"] and idx + 1 < len(words):
                     extracted_info["name"] = words[idx + 1].strip("!.,")
         
-        if any(word in user_message.lower() for word in ["love", "like", "enjoy"]):
+        if any(word in message_lower for word in ["love", "like", "enjoy"]):
             # Extract interests
-            if "hiking" in user_message.lower():
+            if "hiking" in message_lower:
                 extracted_info["interests"] = ["hiking"]
         
         # Update user profile
@@ -136,19 +151,21 @@ async def simulate_conversation():
         
         # Get user profile to show memory
         profile = await memory_manager.get_user_profile(user_id)
-        if profile.name or profile.preferences.get("interests"):
+        if profile.name or profile.interests:
             print(f"   🧠 Memory: ", end="")
             if profile.name:
                 print(f"Name={profile.name}", end=" ")
-            if profile.preferences.get("interests"):
-                print(f"Interests={profile.preferences['interests']}", end="")
+            if profile.interests:
+                print(f"Interests={profile.interests}", end="")
             print()
         
         # Build context for response
         memory_context = await memory_manager.build_context_for_llm(user_id, session_id)
         
         # Generate a simple rule-based response (since we don't have API key)
-        bot_response = generate_demo_response(user_message, persona, tone_result, memory_context)
+        bot_response = generate_demo_response(
+            user_message, persona, tone_result, memory_context, message_lower
+        )
         print(f"🤖 {persona['name']}: {bot_response}")
         
         # Save bot response to session
@@ -165,7 +182,7 @@ async def simulate_conversation():
     profile = await memory_manager.get_user_profile(user_id)
     print(f"User Profile for {user_id}:")
     print(f"  Name: {profile.name}")
-    print(f"  Interests: {', '.join(profile.preferences.get('interests', []))}")
+    print(f"  Interests: {', '.join(profile.interests)}")
     print(f"  Total Interactions: {profile.interaction_count}")
     print(f"  First Seen: {profile.first_seen}")
     print(f"  Last Seen: {profile.last_seen}")
@@ -179,44 +196,68 @@ async def simulate_conversation():
     await backend.disconnect()
 
 
-def generate_demo_response(user_message: str, persona: dict, tone: dict, context: dict) -> str:
+# Demo intents in priority order: the first whose keywords appear wins
+_DEMO_TRIGGERS = (
+    ("greeting", ("hey", "hi")),
+    ("interest", ("love", "like")),
+    ("question", ("what do you",)),
+    ("support", ("rough day",)),
+    ("recall", ("remember",)),
+)
+_SUPPORT_EMOTIONS = frozenset({"sad", "frustrated"})
+
+
+def _demo_intent(message_lower: str, emotion: str) -> str:
+    """Pick the demo response intent from an already-lowercased message."""
+    for intent, keywords in _DEMO_TRIGGERS:
+        if intent == "support" and emotion in _SUPPORT_EMOTIONS:
+            return intent
+        if any(keyword in message_lower for keyword in keywords):
+            return intent
+    return "default"
+
+
+def generate_demo_response(
+    user_message: str,
+    persona: dict,
+    tone: dict,
+    context: dict,
+    message_lower: Optional[str] = None
+) -> str:
     """Generate a simple rule-based response for demo purposes."""
     
     name = context.get("user_profile", {}).get("name")
     interests = context.get("user_profile", {}).get("interests", [])
     emotion = tone.get("primary_emotion", "neutral")
     
-    # Personality-based responses
-    responses = []
+    # Lowercase once (unless the caller did) and resolve the intent in one dispatch
+    if message_lower is None:
+        message_lower = user_message.lower()
+    intent = _demo_intent(message_lower, emotion)
     
-    if "hey" in user_message.lower() or "hi" in user_message.lower():
+    # Personality-based responses
+    if intent == "greeting":
         if name:
-            responses.append(f"hey {name}! what's up? 😊")
-        else:
-            responses.append("hey there! what's good?")
+            return f"hey {name}! what's up? 😊"
+        return "hey there! what's good?"
     
-    elif "love" in user_message.lower() or "like" in user_message.lower():
-        if "hiking" in user_message.lower():
-            responses.append("omg hiking is amazing! there's something about being in nature that just hits different, you know?")
-        else:
-            responses.append("that's so cool! i love when people are passionate about things")
+    if intent == "interest":
+        if "hiking" in message_lower:
+            return "omg hiking is amazing! there's something about being in nature that just hits different, you know?"
+        return "that's so cool! i love when people are passionate about things"
     
-    elif "what do you" in user_message.lower():
-        responses.append("honestly? i'm all about good conversations and connecting with people. also obsessed with music and late night thoughts lol")
+    if intent == "question":
+        return "honestly? i'm all about good conversations and connecting with people. also obsessed with music and late night thoughts lol"
     
-    elif "rough day" in user_message.lower() or emotion in ["sad", "frustrated"]:
-        responses.append("aw i'm sorry you're going through it :( wanna talk about it? sometimes venting helps")
+    if intent == "support":
+        return "aw i'm sorry you're going through it :( wanna talk about it? sometimes venting helps"
     
-    elif "remember" in user_message.lower():
+    if intent == "recall":
         if interests:
-            responses.append(f"of course! you mentioned you're into {', '.join(interests)}! how could i forget? 😄")
-        else:
-            responses.append("hmm, refresh my memory? what are you thinking of?")
+            return f"of course! you mentioned you're into {', '.join(interests)}! how could i forget? 😄"
+        return "hmm, refresh my memory? what are you thinking of?"
     
-    else:
-        responses.append("interesting! tell me more")
-    
-    return responses[0] if responses else "yeah totally get that"
+    return "interesting! tell me more"
 
 
 if __name__ == "__main__":
@@ -225,6 +266,9 @@ if __name__ == "__main__":
     print()
     
     try:
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        
         asyncio.run(simulate_conversation())
     except KeyboardInterrupt:
         print("\n\n👋 Demo interrupted by user.")
@@ -5,17 +5,25 @@ Production-ready REST API for the chatbot system.
 
 Endpoints:
 - POST /chat - Send a message
+- POST /chat/stream - Send a message, stream the reply (server-sent events)
 - POST /start - Start a new conversation
 - GET /users/{user_id}/stats - Get user statistics
 - GET /health - Health check
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
+import logging
+import logging.handlers
+import orjson
 import os
-import uuid
+import queue
+import secrets
+import time
 
 from chatbot_system import ChatbotEngine
 
@@ -55,9 +63,48 @@ class HealthResponse(BaseModel):
 app = FastAPI(
     title="Human-like Chatbot API",
     description="Production chatbot with emotional intelligence and memory",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # orjson encodes response bodies
 )
 
+# Probes can hit /health often; reuse a result for this many seconds
+HEALTH_CHECK_TTL = 10.0
+
+# Chatbot instance, set once on startup; handlers read it from app.state
+app.state.chatbot = None
+
+# Paths that are served before the chatbot is ready
+_NO_CHATBOT_PATHS = frozenset({"/", "/docs", "/redoc", "/openapi.json"})
+
+
+class ChatbotReadyMiddleware:
+    """
+    Reject requests with 503 until the chatbot is initialized.
+    
+    A plain ASGI middleware, so the readiness check costs one attribute
+    lookup per request instead of a dependency resolution per route.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["app"].state.chatbot is None
+            and scope["path"] not in _NO_CHATBOT_PATHS
+        ):
+            response = ORJSONResponse(
+                {"detail": "Chatbot not initialized"}, status_code=503
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+# Added before CORS so CORS headers also wrap the 503s
+app.add_middleware(ChatbotReadyMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -67,14 +114,160 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global chatbot instance
-chatbot: Optional[ChatbotEngine] = None
+# Streamed responses that must reach the client chunk by chunk
+_UNCOMPRESSED_PATHS = frozenset({"/chat/stream"})
+
+
+class SelectiveGZipMiddleware:
+    """
+    GZipMiddleware that leaves server-sent event streams alone.
+    
+    Starlette's GZipMiddleware buffers streamed bodies on the versions
+    fastapi>=0.108 allows, which would deliver SSE chunks late and in
+    batches, so streaming paths bypass it.
+    """
+    
+    def __init__(self, app, **options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **options)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in _UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+# Compress JSON bodies worth it; level 4 keeps CPU cost low
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=512, compresslevel=4)
+
+logger = logging.getLogger(__name__)
+
+# Log one request in this many (uvicorn's per-request access log is off)
+REQUEST_LOG_SAMPLE_RATE = 100
+
+
+class SampledRequestLogMiddleware:
+    """Log method, path, status and latency for a sample of requests."""
+    
+    def __init__(self, app, sample_rate: int = REQUEST_LOG_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+        self._count = 0
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/health":
+            await self.app(scope, receive, send)
+            return
+        
+        self._count += 1
+        if self._count % self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            logger.info(
+                "%s %s %d %.1fms",
+                scope["method"], scope["path"], status,
+                (time.perf_counter() - start) * 1000
+            )
+
+
+app.add_middleware(SampledRequestLogMiddleware)
+
+
+class _SkipHealthAccessLog(logging.Filter):
+    """Drop uvicorn access-log lines for /health probes."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn access records: (client, method, path, http_version, status)
+        args = record.args
+        return not (isinstance(args, tuple) and len(args) > 2 and args[2] == "/health")
+
+
+def _configure_logging() -> logging.handlers.QueueListener:
+    """
+    Route all log records through a queue.
+    
+    Handlers only enqueue on the event loop thread; the listener thread
+    does the formatting and the blocking writes to stderr.
+    
+    Returns:
+        The started listener (stop it on shutdown to flush)
+    """
+    log_queue = queue.SimpleQueue()
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+    logging.getLogger("uvicorn.access").addFilter(_SkipHealthAccessLog())
+    
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def _new_session_id() -> str:
+    """Generate a random 128-bit session ID (cheaper than str(uuid4()))."""
+    return secrets.token_hex(16)
+
+
+def _chat_payload(response) -> Dict[str, Any]:
+    """Build the ChatResponse schema body from an engine response."""
+    return {
+        "text": response.text,
+        "user_id": response.user_id,
+        "session_id": response.session_id,
+        "detected_tone": response.detected_tone,
+        "response_time_ms": response.response_time_ms,
+        "metadata": response.metadata
+    }
+
+
+def _chat_response(response) -> ORJSONResponse:
+    """
+    Encode an engine response as the ChatResponse schema.
+    
+    The engine's fields are already typed, so the body is built directly;
+    returning a Response also makes FastAPI skip re-validating it against
+    response_model, which stays on the routes for the OpenAPI schema.
+    """
+    return ORJSONResponse(_chat_payload(response))
+
+
+async def _sse_events(chunks):
+    """
+    Encode chat_stream chunks as server-sent events.
+    
+    Text chunks are sent as plain `data:` events; the final chunk becomes
+    a `done` event carrying the full ChatResponse body.
+    """
+    async for chunk in chunks:
+        if chunk["done"]:
+            payload = orjson.dumps(_chat_payload(chunk["response"]))
+            yield b"event: done\ndata: " + payload + b"\n\n"
+        else:
+            yield b"data: " + orjson.dumps({"text": chunk["text"]}) + b"\n\n"
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize chatbot on startup."""
-    global chatbot
+    app.state.log_listener = _configure_logging()
     
     print("Initializing chatbot system...")
     
@@ -87,6 +280,8 @@ async def startup_event():
         enable_tone_adaptation=True
     )
     
+    app.state.chatbot = chatbot
+    
     # Health check
     health = await chatbot.health_check()
     if not health["overall"]:
@@ -100,20 +295,15 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown."""
     print("Shutting down chatbot system...")
-
-
-def get_chatbot() -> ChatbotEngine:
-    """Dependency to get chatbot instance."""
-    if chatbot is None:
-        raise HTTPException(status_code=503, detail="Chatbot not initialized")
-    return chatbot
+    if app.state.chatbot:
+        await app.state.chatbot.shutdown()
+    
+    # Flush queued log records
+    app.state.log_listener.stop()
 
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(
-    request: ChatRequest,
-    bot: ChatbotEngine = Depends(get_chatbot)
-):
+async def chat_endpoint(request: ChatRequest, http_request: Request):
     """
     Send a message to the chatbot.
     
@@ -125,34 +315,53 @@ async def chat_endpoint(
     """
     try:
         # Generate session ID if not provided
-        session_id = request.session_id or str(uuid.uuid4())
+        session_id = request.session_id or _new_session_id()
         
         # Process message
-        response = await bot.chat(
+        response = await http_request.app.state.chatbot.chat(
             user_id=request.user_id,
             message=request.message,
             session_id=session_id,
             metadata=request.metadata
         )
         
-        return ChatResponse(
-            text=response.text,
-            user_id=response.user_id,
-            session_id=response.session_id,
-            detected_tone=response.detected_tone,
-            response_time_ms=response.response_time_ms,
-            metadata=response.metadata
-        )
+        return _chat_response(response)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest, http_request: Request):
+    """
+    Send a message and stream the reply as server-sent events.
+    
+    Args:
+        request: Chat request with user_id and message
+        
+    Returns:
+        text/event-stream of reply chunks, ending with a `done` event
+        that carries the complete chat response
+    """
+    session_id = request.session_id or _new_session_id()
+    
+    chunks = http_request.app.state.chatbot.chat_stream(
+        user_id=request.user_id,
+        message=request.message,
+        session_id=session_id,
+        metadata=request.metadata
+    )
+    
+    return StreamingResponse(
+        _sse_events(chunks),
+        media_type="text/event-stream",
+        # Keep caches and reverse proxies (nginx) from holding events back
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/start", response_model=ChatResponse)
-async def start_conversation(
-    request: StartConversationRequest,
-    bot: ChatbotEngine = Depends(get_chatbot)
-):
+async def start_conversation(request: StartConversationRequest, http_request: Request):
     """
     Start a new conversation with a greeting.
     
@@ -163,31 +372,21 @@ async def start_conversation(
         Chat response with greeting
     """
     try:
-        session_id = request.session_id or str(uuid.uuid4())
+        session_id = request.session_id or _new_session_id()
         
-        response = await bot.start_conversation(
+        response = await http_request.app.state.chatbot.start_conversation(
             user_id=request.user_id,
             session_id=session_id
         )
         
-        return ChatResponse(
-            text=response.text,
-            user_id=response.user_id,
-            session_id=response.session_id,
-            detected_tone=response.detected_tone,
-            response_time_ms=response.response_time_ms,
-            metadata=response.metadata
-        )
+        return _chat_response(response)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/users/{user_id}/stats")
-async def get_user_stats(
-    user_id: str,
-    bot: ChatbotEngine = Depends(get_chatbot)
-):
+async def get_user_stats(user_id: str, request: Request):
     """
     Get statistics for a specific user.
     
@@ -198,7 +397,7 @@ async def get_user_stats(
         User statistics
     """
     try:
-        stats = await bot.get_user_stats(user_id)
+        stats = await request.app.state.chatbot.get_user_stats(user_id)
         return stats
     
     except Exception as e:
@@ -206,7 +405,7 @@ async def get_user_stats(
 
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check(bot: ChatbotEngine = Depends(get_chatbot)):
+async def health_check(request: Request):
     """
     Check system health.
     
@@ -214,7 +413,7 @@ async def health_check(bot: ChatbotEngine = Depends(get_chatbot)):
         Health status of all components
     """
     try:
-        checks = await bot.health_check()
+        checks = await request.app.state.chatbot.health_check(max_age=HEALTH_CHECK_TTL)
         
         status = "healthy" if checks["overall"] else "unhealthy"
         
@@ -231,14 +430,17 @@ async def health_check(bot: ChatbotEngine = Depends(get_chatbot)):
 
 
 @app.get("/stats")
-async def system_stats(bot: ChatbotEngine = Depends(get_chatbot)):
+async def system_stats(request: Request):
     """
     Get system-wide statistics.
     
     Returns:
         System statistics
     """
-    return bot.get_system_stats()
+    # Counters are kept per process; with several workers this is one worker's view
+    stats = request.app.state.chatbot.get_system_stats()
+    stats["worker_pid"] = os.getpid()
+    return stats
 
 
 @app.get("/")
@@ -252,13 +454,34 @@ async def root():
 
 
 if __name__ == "__main__":
+    from importlib.util import find_spec
     import uvicorn
     
-    uvicorn.run(
-        "api_server:app",
+    # uvloop + httptools when installed (uvicorn[standard]); stdlib otherwise
+    server_options = dict(
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        log_config=None,  # uvicorn's loggers propagate to the queued root logger
+        access_log=False,  # SampledRequestLogMiddleware logs a sample instead
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        interface="asgi3"
     )
-
+    
+    if os.getenv("ENVIRONMENT", "development") == "production":
+        # Each worker has its own chatbot instance and process-local state,
+        # so more than one worker must be asked for explicitly
+        uvicorn.run(
+            "api_server:app",
+            workers=int(os.getenv("WEB_CONCURRENCY") or 1),
+            log_level="warning",
+            **server_options
+        )
+    else:
+        uvicorn.run(
+            "api_server:app",
+            # Opt-in: the reloader runs a file watcher and a second process
+            reload=os.getenv("API_RELOAD") == "1",
+            log_level="info",
+            **server_options
+        )
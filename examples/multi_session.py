@@ -12,6 +12,11 @@ import os
 from chatbot_system import ChatbotEngine
 import uuid
 
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
 
 async def session_1(bot, user_id):
     """First conversation session."""
@@ -111,6 +116,9 @@ async def main():
     
     await session_3(bot, user_id)
     
+    # Make sure every turn has been saved before reading stats
+    await bot.flush()
+    
     # Show final stats
     print("\n" + "="*60)
     print("FINAL USER PROFILE")
@@ -125,5 +133,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     asyncio.run(main())
 
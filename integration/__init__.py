@@ -2,11 +2,12 @@
 Integration layer for external APIs.
 """
 
-from .gemini_client import GeminiClient
+from .gemini_client import GeminiClient, BatchingGeminiClient
 from .prompt_builder import PromptBuilder
 
 __all__ = [
     "GeminiClient",
+    "BatchingGeminiClient",
     "PromptBuilder",
 ]
 
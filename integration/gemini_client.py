@@ -8,10 +8,15 @@ Provides:
 - Safety settings
 """
 
+import logging
 import os
-from typing import Dict, List, Optional, Any
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 import asyncio
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -20,6 +25,39 @@ from tenacity import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying; anything else (bad request, auth) fails at once
+_TRANSIENT_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.InternalServerError,
+)
+
+# Exact token counts kept per client (prompt prefixes repeat across turns)
+_TOKEN_CACHE_SIZE = 4096
+
+# First non-whitespace character; finds it without copying the input
+_NON_WHITESPACE = re.compile(r"\S")
+
+# Prompt label per history role; anything that isn't the user is the bot
+_SPEAKERS = {"user": "User"}
+
+
+# genai.configure() drops the SDK's cached service clients (and their open
+# connections), so only call it when the API key actually changes.
+_configured_api_key: Optional[str] = None
+
+
+def _configure_genai(api_key: str):
+    """Configure the Gemini SDK once per process and API key."""
+    global _configured_api_key
+    if api_key != _configured_api_key:
+        genai.configure(api_key=api_key)
+        _configured_api_key = api_key
+
+
 class GeminiClient:
     """
     Client for Google Gemini API with retry logic and error handling.
@@ -49,7 +87,7 @@ class GeminiClient:
         if not self.api_key:
             raise ValueError("Gemini API key not provided")
         
-        genai.configure(api_key=self.api_key)
+        _configure_genai(self.api_key)
         
         self.model_name = model
         self.temperature = temperature
@@ -90,12 +128,17 @@ class GeminiClient:
             generation_config=self.generation_config,
             safety_settings=self.safety_settings
         )
+        
+        # Exact token counts from the API, least recently used evicted first
+        self._token_counts: "OrderedDict[str, int]" = OrderedDict()
+        
+        # Per-call generation configs, one per distinct temperature
+        self._generation_config_for = lru_cache(maxsize=16)(self._make_generation_config)
+        
+        # In-flight requests keyed by (temperature, full prompt), for
+        # coalescing duplicates
+        self._inflight: Dict[tuple, asyncio.Task] = {}
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
-    )
     async def generate_response(
         self,
         system_prompt: str,
@@ -105,6 +148,9 @@ class GeminiClient:
         """
         Generate a response using Gemini API.
         
+        Concurrent calls that build the exact same prompt share a single
+        API request.
+        
         Args:
             system_prompt: System prompt defining persona and behavior
             conversation_history: List of message exchanges
@@ -113,18 +159,36 @@ class GeminiClient:
         Returns:
             Dictionary with response text and metadata
         """
+        # Build prompt
+        full_prompt = self._build_prompt(
+            system_prompt,
+            conversation_history,
+            context
+        )
+        
+        key = (self.temperature, full_prompt)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(full_prompt, self.temperature))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # shield: one caller giving up must not cancel the shared request
+        return dict(await asyncio.shield(task))
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(_TRANSIENT_ERRORS),
+        reraise=True
+    )
+    async def _generate(self, full_prompt: str, temperature: float) -> Dict[str, Any]:
+        """Send a built prompt to Gemini and parse the response."""
         try:
-            # Build prompt
-            full_prompt = self._build_prompt(
-                system_prompt,
-                conversation_history,
-                context
-            )
-            
-            # Generate response
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                full_prompt
+            # Native async transport: no worker thread held per request
+            response = await self.model.generate_content_async(
+                full_prompt,
+                generation_config=self._generation_config_for(temperature)
             )
             
             # Extract text
@@ -149,9 +213,8 @@ class GeminiClient:
                 "finish_reason": self._get_finish_reason(response)
             }
             
-        except Exception as e:
-            # Log error and return fallback
-            print(f"Error generating response: {e}")
+        except Exception:
+            logger.exception("Error generating response")
             raise
     
     def _build_prompt(
@@ -167,17 +230,13 @@ class GeminiClient:
         if context:
             parts.append(f"\n{context}")
         
-        # Add conversation history
+        # Add conversation history (rendered in one pass, joined once)
         if conversation_history:
             parts.append("\n")
-            for msg in conversation_history:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                
-                if role == "user":
-                    parts.append(f"User: {content}")
-                else:
-                    parts.append(f"You: {content}")
+            parts += [
+                f"{_SPEAKERS.get(msg.get('role', 'user'), 'You')}: {msg.get('content', '')}"
+                for msg in conversation_history
+            ]
         
         return "\n".join(parts)
     
@@ -206,7 +265,7 @@ class GeminiClient:
             context: Additional context
             
         Yields:
-            Response chunks
+            Response chunks; the final chunk has done=True and token usage
         """
         full_prompt = self._build_prompt(
             system_prompt,
@@ -215,21 +274,28 @@ class GeminiClient:
         )
         
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content,
+            response = await self.model.generate_content_async(
                 full_prompt,
+                generation_config=self._generation_config_for(self.temperature),
                 stream=True
             )
             
-            for chunk in response:
+            usage = {}
+            async for chunk in response:
                 if chunk.candidates:
                     text = chunk.candidates[0].content.parts[0].text
                     yield {"text": text, "done": False}
+                if getattr(chunk, 'usage_metadata', None):
+                    usage = {
+                        "prompt_tokens": getattr(chunk.usage_metadata, 'prompt_token_count', 0),
+                        "response_tokens": getattr(chunk.usage_metadata, 'candidates_token_count', 0),
+                        "total_tokens": getattr(chunk.usage_metadata, 'total_token_count', 0)
+                    }
             
-            yield {"text": "", "done": True}
+            yield {"text": "", "done": True, "usage": usage}
             
-        except Exception as e:
-            print(f"Streaming error: {e}")
+        except Exception:
+            logger.exception("Streaming error")
             yield {"text": "Sorry, something went wrong.", "done": True}
     
     def estimate_tokens(self, text: str) -> int:
@@ -245,6 +311,36 @@ class GeminiClient:
         # Rough estimation: ~4 characters per token for English
         return len(text) // 4
     
+    async def count_tokens(self, text: str) -> int:
+        """
+        Count tokens for text with the model's own tokenizer.
+        
+        Results are cached per text, so repeated prompt prefixes cost one
+        API call. Falls back to estimate_tokens if the call fails.
+        
+        Args:
+            text: Text to count
+            
+        Returns:
+            Token count
+        """
+        count = self._token_counts.get(text)
+        if count is not None:
+            self._token_counts.move_to_end(text)
+            return count
+        
+        try:
+            response = await self.model.count_tokens_async(text)
+        except Exception as e:
+            logger.warning("Token count failed, using estimate: %s", e)
+            return self.estimate_tokens(text)
+        
+        count = response.total_tokens
+        self._token_counts[text] = count
+        if len(self._token_counts) > _TOKEN_CACHE_SIZE:
+            self._token_counts.popitem(last=False)
+        return count
+    
     def validate_input(self, text: str, max_length: int = 2000) -> tuple[bool, Optional[str]]:
         """
         Validate user input.
@@ -256,7 +352,7 @@ class GeminiClient:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if not text or not text.strip():
+        if not text or _NON_WHITESPACE.search(text) is None:
             return False, "Empty input"
         
         if len(text) > max_length:
@@ -265,16 +361,25 @@ class GeminiClient:
         return True, None
     
     def set_temperature(self, temperature: float):
-        """Update temperature setting."""
+        """
+        Update temperature setting.
+        
+        The model is left as is; the temperature is applied per call
+        through a cached GenerationConfig.
+        """
         if 0.0 <= temperature <= 1.0:
             self.temperature = temperature
-            self.generation_config.temperature = temperature
-            # Reinitialize model with new config
-            self.model = genai.GenerativeModel(
-                model_name=self.model_name,
-                generation_config=self.generation_config,
-                safety_settings=self.safety_settings
-            )
+    
+    def _make_generation_config(self, temperature: float) -> genai.GenerationConfig:
+        """Build the generation config for a temperature (cached per value)."""
+        if temperature == self.generation_config.temperature:
+            return self.generation_config
+        return genai.GenerationConfig(
+            temperature=temperature,
+            top_p=self.top_p,
+            top_k=self.top_k,
+            max_output_tokens=self.max_tokens,
+        )
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about current model configuration."""
@@ -290,20 +395,165 @@ class GeminiClient:
         """
         Test API connection.
         
+        Uses the count_tokens endpoint, which checks auth and reachability
+        like a generation would but is fast and uses no quota.
+        
         Returns:
             True if connection successful
         """
         try:
-            response = await self.generate_response(
-                system_prompt="You are a test.",
-                conversation_history=[{"role": "user", "content": "Hi"}],
-                context=None
-            )
-            return bool(response.get("text"))
+            response = await self.model.count_tokens_async("ping")
+            return response.total_tokens > 0
         except Exception as e:
-            print(f"Connection test failed: {e}")
+            logger.warning("Connection test failed: %s", e)
             return False
     
     def __repr__(self) -> str:
         return f"GeminiClient(model={self.model_name}, temp={self.temperature})"
 
+
+
+class BatchingGeminiClient:
+    """
+    Coalesces concurrent generate_response calls into micro-batches.
+    
+    Requests are queued and drained by a background task: it waits up to
+    max_wait_ms for up to max_batch requests and hands each batch to its own
+    task, which issues them to the wrapped GeminiClient and resolves each
+    caller's future. Batches run concurrently, so one slow call never holds
+    up the requests queued behind it; max_in_flight optionally caps the
+    number of concurrent API calls. Everything else is delegated to the
+    wrapped client.
+    """
+    
+    def __init__(
+        self,
+        client: GeminiClient,
+        max_batch: int = 8,
+        max_wait_ms: int = 20,
+        max_in_flight: Optional[int] = None
+    ):
+        """
+        Initialize batching client.
+        
+        Args:
+            client: GeminiClient that performs the actual requests
+            max_batch: Maximum number of requests sent per batch
+            max_wait_ms: How long to wait for a batch to fill up
+            max_in_flight: Maximum concurrent API calls (None for no limit)
+        """
+        self.client = client
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+        self._limit = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._collecting: List[Tuple[tuple, asyncio.Future]] = []
+        self._dispatches = set()
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not defined here (validate_input, model_name, ...)
+        return getattr(self.client, name)
+    
+    async def generate_response(
+        self,
+        system_prompt: str,
+        conversation_history: List[Dict[str, str]],
+        context: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a generation request and wait for its batch to complete.
+        
+        Args:
+            system_prompt: System prompt defining persona and behavior
+            conversation_history: List of message exchanges
+            context: Additional context (memory, user profile, etc.)
+            
+        Returns:
+            Dictionary with response text and metadata
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._drain())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((system_prompt, conversation_history, context), future))
+        return await future
+    
+    async def _drain(self):
+        """Collect queued requests into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            # Kept on self so close() can fail requests caught mid-collection
+            self._collecting = batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            self._collecting = []
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[tuple, asyncio.Future]]):
+        """Issue one batch and resolve its callers' futures."""
+        results = await asyncio.gather(
+            *(self._generate(args) for args, _ in batch),
+            return_exceptions=True
+        )
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():  # Caller gave up waiting
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def _generate(self, args: tuple) -> Dict[str, Any]:
+        """Call the wrapped client, within the in-flight limit if there is one."""
+        if self._limit is None:
+            return await self.client.generate_response(*args)
+        async with self._limit:
+            return await self.client.generate_response(*args)
+    
+    async def close(self):
+        """
+        Stop the batching task.
+        
+        Requests not yet dispatched fail with RuntimeError instead of waiting
+        forever; batches already sent are allowed to finish.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        pending, self._collecting = self._collecting, []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("BatchingGeminiClient is closed"))
+        
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+    
+    def __repr__(self) -> str:
+        return (
+            f"BatchingGeminiClient({self.client!r}, "
+            f"max_batch={self.max_batch}, max_wait_ms={self.max_wait * 1000:g}, "
+            f"max_in_flight={self.max_in_flight})"
+        )
@@ -2,11 +2,18 @@
 Memory management system for persistent user context and conversation history.
 """
 
-from .memory_manager import MemoryManager, UserProfile, ConversationSummary, SessionContext
+from .memory_manager import (
+    MemoryManager,
+    CachedMemoryManager,
+    UserProfile,
+    ConversationSummary,
+    SessionContext,
+)
 from .redis_backend import RedisBackend
 
 __all__ = [
     "MemoryManager",
+    "CachedMemoryManager",
     "UserProfile",
     "ConversationSummary",
     "SessionContext",
@@ -7,61 +7,154 @@ Handles three types of memory:
 3. Session Context (current): Active conversation state
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict, deque
+from functools import lru_cache
+from dataclasses import dataclass, field, fields
+from typing import Deque, Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
-import json
+import asyncio
+import time
+import orjson
 
 
-@dataclass
-class UserProfile:
+# A serialized record: UTF-8 JSON bytes as written and as read back from
+# Redis, or str from text-based backends (MongoDB); orjson parses both
+Record = Union[bytes, str]
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a memory record to UTF-8 JSON bytes (orjson, C-accelerated)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+_loads = orjson.loads
+
+
+@lru_cache(maxsize=1)
+def _iso_for_second(second: int) -> str:
+    """Format a Unix second as a UTC ISO timestamp (cached for the current second)."""
+    return datetime.utcfromtimestamp(second).isoformat()
+
+
+def _append_unique(seen: Dict[str, Tuple[list, set]], key: str, items: list, item: Any):
+    """
+    Append item to items unless it is already there.
+    
+    Membership is checked against a set kept in seen under key, so repeated
+    adds don't rescan the list. The set is rebuilt if items was replaced or
+    changed size behind its back (e.g. a caller edited the list directly).
+    """
+    entry = seen.get(key)
+    if entry is None or entry[0] is not items or len(entry[1]) != len(items):
+        entry = seen[key] = (items, set(items))
+    if item not in entry[1]:
+        entry[1].add(item)
+        items.append(item)
+
+
+def _now_iso() -> str:
+    """
+    Current UTC time as an ISO timestamp, to the second.
+    
+    Records stamp several times per turn; within one second they share a
+    single formatted string instead of building a datetime each time.
+    """
+    return _iso_for_second(int(time.time()))
+
+
+class _JSONRecord:
+    """
+    Stored-JSON codec shared by the memory records.
+    
+    Subclasses provide the hand-written to_dict/from_dict pair; this wraps
+    it with the orjson encode/decode so storage code deals in one call.
+    """
+    
+    __slots__ = ()
+    
+    def to_json(self) -> bytes:
+        """Serialize to UTF-8 JSON bytes for storage."""
+        return _dumps(self.to_dict())
+    
+    @classmethod
+    def from_json(cls, data: Record):
+        """Create from a stored JSON record (bytes or str)."""
+        return cls.from_dict(_loads(data))
+
+
+# UserProfile list fields that add_preference accepts
+_PREFERENCE_CATEGORIES = ("interests", "likes", "dislikes")
+
+
+@dataclass(slots=True)
+class UserProfile(_JSONRecord):
     """Long-term user profile stored persistently."""
     
     user_id: str
     name: Optional[str] = None
-    preferences: Dict[str, List[str]] = field(default_factory=lambda: {
-        "interests": [],
-        "likes": [],
-        "dislikes": []
-    })
+    interests: List[str] = field(default_factory=list)
+    likes: List[str] = field(default_factory=list)
+    dislikes: List[str] = field(default_factory=list)
     personality_notes: List[str] = field(default_factory=list)
     interaction_count: int = 0
-    first_seen: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    last_seen: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    first_seen: str = field(default_factory=_now_iso)
+    last_seen: str = field(default_factory=_now_iso)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Dedup sets for the list fields, built on first add (not stored)
+    _seen: Dict[str, Tuple[list, set]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (shares field values; serialize, don't mutate)."""
+        return {
+            "user_id": self.user_id,
+            "name": self.name,
+            "interests": self.interests,
+            "likes": self.likes,
+            "dislikes": self.dislikes,
+            "personality_notes": self.personality_notes,
+            "interaction_count": self.interaction_count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "metadata": self.metadata
+        }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'UserProfile':
-        """Create from dictionary."""
-        return cls(**data)
+        """Create from dictionary (a to_dict() record skips __init__)."""
+        if data.keys() != _RECORD_FIELDS.get(cls):
+            if "preferences" in data:
+                # Stored before preferences were flattened into fields
+                data = dict(data)
+                preferences = data.pop("preferences") or {}
+                for category in _PREFERENCE_CATEGORIES:
+                    data.setdefault(category, preferences.get(category, []))
+            return cls(**data)  # Older/partial record: defaults fill the gaps
+        obj = object.__new__(cls)
+        for name, value in data.items():
+            setattr(obj, name, value)
+        obj._seen = {}
+        return obj
     
     def update_last_seen(self):
         """Update last seen timestamp."""
-        self.last_seen = datetime.utcnow().isoformat()
+        self.last_seen = _now_iso()
         self.interaction_count += 1
     
     def add_interest(self, interest: str):
         """Add an interest to the user profile."""
-        if "interests" not in self.preferences:
-            self.preferences["interests"] = []
-        if interest not in self.preferences["interests"]:
-            self.preferences["interests"].append(interest)
+        _append_unique(self._seen, "interests", self.interests, interest)
     
     def add_preference(self, category: str, item: str):
-        """Add a preference (like/dislike)."""
-        if category not in self.preferences:
-            self.preferences[category] = []
-        if item not in self.preferences[category]:
-            self.preferences[category].append(item)
+        """Add a preference (interests, likes or dislikes)."""
+        if category not in _PREFERENCE_CATEGORIES:
+            raise ValueError(f"Unknown preference category: {category}")
+        _append_unique(self._seen, category, getattr(self, category), item)
     
     def add_personality_note(self, note: str):
         """Add a personality observation."""
-        if note not in self.personality_notes:
-            self.personality_notes.append(note)
+        _append_unique(self._seen, "personality_notes", self.personality_notes, note)
     
     def get_summary(self) -> str:
         """Get a human-readable summary of the user."""
@@ -70,12 +163,12 @@ class UserProfile:
         if self.name:
             parts.append(f"Name: {self.name}")
         
-        if self.preferences.get("interests"):
-            interests = ", ".join(self.preferences["interests"][:5])
+        if self.interests:
+            interests = ", ".join(self.interests[:5])
             parts.append(f"Interests: {interests}")
         
-        if self.preferences.get("likes"):
-            likes = ", ".join(self.preferences["likes"][:3])
+        if self.likes:
+            likes = ", ".join(self.likes[:3])
             parts.append(f"Likes: {likes}")
         
         if self.personality_notes:
@@ -86,8 +179,8 @@ class UserProfile:
         return " | ".join(parts)
 
 
-@dataclass
-class ConversationSummary:
+@dataclass(slots=True)
+class ConversationSummary(_JSONRecord):
     """Compressed summary of past conversations."""
     
     session_id: str
@@ -96,75 +189,128 @@ class ConversationSummary:
     key_moments: List[str] = field(default_factory=list)
     emotional_arc: Optional[str] = None
     topics_discussed: List[str] = field(default_factory=list)
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=_now_iso)
     original_message_count: int = 0
     tokens_saved: int = 0
+    # Dedup sets for the list fields, built on first add (not stored)
+    _seen: Dict[str, Tuple[list, set]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (shares field values; serialize, don't mutate)."""
+        return {
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "summary": self.summary,
+            "key_moments": self.key_moments,
+            "emotional_arc": self.emotional_arc,
+            "topics_discussed": self.topics_discussed,
+            "timestamp": self.timestamp,
+            "original_message_count": self.original_message_count,
+            "tokens_saved": self.tokens_saved
+        }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'ConversationSummary':
-        """Create from dictionary."""
-        return cls(**data)
+        """Create from dictionary (a to_dict() record skips __init__)."""
+        if data.keys() != _RECORD_FIELDS.get(cls):
+            return cls(**data)  # Older/partial record: defaults fill the gaps
+        obj = object.__new__(cls)
+        for name, value in data.items():
+            setattr(obj, name, value)
+        obj._seen = {}
+        return obj
     
     def add_key_moment(self, moment: str):
         """Add a key moment from the conversation."""
-        if moment not in self.key_moments:
-            self.key_moments.append(moment)
+        _append_unique(self._seen, "key_moments", self.key_moments, moment)
     
     def add_topic(self, topic: str):
         """Add a discussed topic."""
-        if topic not in self.topics_discussed:
-            self.topics_discussed.append(topic)
+        _append_unique(self._seen, "topics_discussed", self.topics_discussed, topic)
 
 
-@dataclass
-class SessionContext:
+@dataclass(slots=True)
+class SessionContext(_JSONRecord):
     """Current session state and recent exchanges."""
     
     session_id: str
     user_id: str
     current_topic: Optional[str] = None
     current_mood: Optional[str] = None
-    recent_exchanges: List[Dict[str, Any]] = field(default_factory=list)
-    started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    last_activity: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    recent_exchanges: Deque[Dict[str, Any]] = field(default_factory=deque)
+    started_at: str = field(default_factory=_now_iso)
+    last_activity: str = field(default_factory=_now_iso)
     context_window: int = 8  # Keep last N exchanges
+    # LLM-shaped view of recent_exchanges, rebuilt after changes (not stored)
+    _history: Optional[List[Dict[str, str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        # Bounded deque: appending past context_window drops the oldest
+        self.recent_exchanges = deque(self.recent_exchanges, maxlen=self.context_window)
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (shares field values; serialize, don't mutate)."""
+        return {
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "current_topic": self.current_topic,
+            "current_mood": self.current_mood,
+            "recent_exchanges": list(self.recent_exchanges),
+            "started_at": self.started_at,
+            "last_activity": self.last_activity,
+            "context_window": self.context_window
+        }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'SessionContext':
-        """Create from dictionary."""
-        return cls(**data)
+        """Create from dictionary (a to_dict() record skips __init__)."""
+        if data.keys() != _RECORD_FIELDS.get(cls):
+            return cls(**data)  # Older/partial record: defaults fill the gaps
+        obj = object.__new__(cls)
+        for name, value in data.items():
+            setattr(obj, name, value)
+        obj.recent_exchanges = deque(obj.recent_exchanges, maxlen=obj.context_window)
+        obj._history = None
+        return obj
     
     def add_exchange(self, role: str, text: str, metadata: Optional[Dict] = None):
         """Add a message exchange to the session."""
         exchange = {
             "role": role,
             "text": text,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "metadata": metadata or {}
         }
         
+        # Bounded to the last context_window exchanges
         self.recent_exchanges.append(exchange)
+        self._history = None
         
-        # Keep only last N exchanges
-        if len(self.recent_exchanges) > self.context_window:
-            self.recent_exchanges = self.recent_exchanges[-self.context_window:]
-        
-        self.last_activity = datetime.utcnow().isoformat()
+        self.last_activity = _now_iso()
+    
+    def keep_recent(self, count: int):
+        """Drop all but the last count exchanges."""
+        while len(self.recent_exchanges) > count:
+            self.recent_exchanges.popleft()
+            self._history = None
     
     def get_conversation_history(self) -> List[Dict[str, str]]:
-        """Get conversation history in format suitable for LLM."""
-        return [
-            {"role": ex["role"], "content": ex["text"]}
-            for ex in self.recent_exchanges
-        ]
+        """
+        Get conversation history in format suitable for LLM.
+        
+        The list is built once per change to the exchanges and shared
+        between callers, so treat it as read-only.
+        """
+        if self._history is None:
+            self._history = [
+                {"role": ex["role"], "content": ex["text"]}
+                for ex in self.recent_exchanges
+            ]
+        return self._history
     
     def update_mood(self, mood: str):
         """Update the current mood."""
@@ -175,6 +321,43 @@ class SessionContext:
         self.current_topic = topic
 
 
+# Stored field names per record type; from_dict only bypasses __init__ for
+# records that carry exactly these keys
+_RECORD_FIELDS = {
+    cls: frozenset(f.name for f in fields(cls) if f.init)
+    for cls in (UserProfile, ConversationSummary, SessionContext)
+}
+
+
+def _profile_view(profile: UserProfile) -> Dict[str, Any]:
+    """The slice of a profile that goes into the LLM context."""
+    return {
+        "name": profile.name,
+        "interests": profile.interests[:5],
+        "likes": profile.likes[:3],
+        "personality": profile.personality_notes[:2] if profile.personality_notes else [],
+        "interaction_count": profile.interaction_count
+    }
+
+
+# Context views keyed by the stored record: an unchanged profile or summary
+# is not decoded again every turn. Views are shared, so treat them as
+# read-only.
+@lru_cache(maxsize=4096)
+def _stored_profile_view(data: Record) -> Dict[str, Any]:
+    return _profile_view(UserProfile.from_json(data))
+
+
+@lru_cache(maxsize=4096)
+def _stored_summary_view(data: Record) -> Dict[str, Any]:
+    summary = ConversationSummary.from_json(data)
+    return {
+        "summary": summary.summary,
+        "key_moments": summary.key_moments[:2],
+        "topics": summary.topics_discussed[:3]
+    }
+
+
 class MemoryManager:
     """
     High-level interface for managing all types of memory.
@@ -185,14 +368,70 @@ class MemoryManager:
     - Session context (current conversation)
     """
     
-    def __init__(self, backend):
+    def __init__(self, backend, local_cache_size: int = 10000, local_cache_ttl: float = 0.0):
         """
         Initialize memory manager with a storage backend.
         
         Args:
             backend: Storage backend (RedisBackend, MongoDBBackend, etc.)
+            local_cache_size: Serialized profiles kept in process memory
+            local_cache_ttl: Seconds a cached profile is trusted; 0
+                (the default) disables the cache. Only enable it when a single
+                process serves the users, since writes from other workers are
+                not seen until the entry expires
         """
         self.backend = backend
+        self.local_cache_size = local_cache_size
+        self.local_cache_ttl = local_cache_ttl
+        self._local_cache: "OrderedDict[str, Tuple[float, Record]]" = OrderedDict()
+    
+    def _cached(self, key: str) -> Optional[Record]:
+        """Get a serialized profile from the in-process cache, if fresh."""
+        if self.local_cache_ttl <= 0:
+            return None
+        
+        entry = self._local_cache.get(key)
+        if entry is None:
+            return None
+        
+        cached_at, data = entry
+        if time.monotonic() - cached_at > self.local_cache_ttl:
+            del self._local_cache[key]
+            return None
+        
+        self._local_cache.move_to_end(key)
+        return data
+    
+    def _cache(self, key: str, data: Record):
+        """Store a serialized profile in the in-process cache."""
+        if self.local_cache_ttl <= 0:
+            return
+        
+        self._local_cache[key] = (time.monotonic(), data)
+        self._local_cache.move_to_end(key)
+        if len(self._local_cache) > self.local_cache_size:
+            self._local_cache.popitem(last=False)
+    
+    async def _read(self, key: str) -> Optional[Record]:
+        """Read a serialized profile/session value from storage."""
+        return await self.backend.get(key)
+    
+    async def _read_many(self, keys: List[str]) -> List[Optional[Record]]:
+        """Read several serialized values from storage in one round trip."""
+        return await self.backend.get_many(keys)
+    
+    async def _read_context(
+        self,
+        keys: List[str],
+        list_key: str,
+        limit: int
+    ) -> Tuple[List[Optional[Record]], List[Record]]:
+        """Read several values plus the head of a list in one round trip."""
+        return await self.backend.get_many_and_list(keys, list_key, limit)
+    
+    async def _write(self, key: str, value: Record, ttl: Optional[int] = None):
+        """Write a serialized profile/session value to storage."""
+        await self.backend.set(key, value, ttl=ttl)
     
     async def get_user_profile(self, user_id: str) -> UserProfile:
         """
@@ -204,10 +443,18 @@ class MemoryManager:
         Returns:
             UserProfile object
         """
-        data = await self.backend.get(f"profile:{user_id}")
-        
+        key = f"profile:{user_id}"
+        data = self._cached(key)
+        if data is None:
+            data = await self._read(key)
+            if data:
+                self._cache(key, data)
+        return await self._load_user_profile(user_id, data)
+    
+    async def _load_user_profile(self, user_id: str, data: Optional[Record]) -> UserProfile:
+        """Deserialize a stored profile, creating a new one if there is none."""
         if data:
-            return UserProfile.from_dict(json.loads(data))
+            return UserProfile.from_json(data)
         else:
             # Create new profile
             profile = UserProfile(user_id=user_id)
@@ -223,8 +470,9 @@ class MemoryManager:
         """
         profile.update_last_seen()
         key = f"profile:{profile.user_id}"
-        value = json.dumps(profile.to_dict())
-        await self.backend.set(key, value, ttl=7776000)  # 90 days
+        value = profile.to_json()
+        await self._write(key, value, ttl=7776000)  # 90 days
+        self._cache(key, value)
     
     async def get_session_context(self, session_id: str, user_id: str) -> SessionContext:
         """
@@ -237,10 +485,18 @@ class MemoryManager:
         Returns:
             SessionContext object
         """
-        data = await self.backend.get(f"session:{session_id}")
-        
+        data = await self._read(f"session:{session_id}")
+        return await self._load_session_context(session_id, user_id, data)
+    
+    async def _load_session_context(
+        self,
+        session_id: str,
+        user_id: str,
+        data: Optional[Record]
+    ) -> SessionContext:
+        """Deserialize a stored session, creating a new one if there is none."""
         if data:
-            return SessionContext.from_dict(json.loads(data))
+            return SessionContext.from_json(data)
         else:
             # Create new session
             session = SessionContext(session_id=session_id, user_id=user_id)
@@ -255,8 +511,8 @@ class MemoryManager:
             session: SessionContext object to save
         """
         key = f"session:{session.session_id}"
-        value = json.dumps(session.to_dict())
-        await self.backend.set(key, value, ttl=86400)  # 24 hours
+        value = session.to_json()
+        await self._write(key, value, ttl=86400)  # 24 hours
     
     async def get_conversation_summaries(
         self, 
@@ -274,7 +530,7 @@ class MemoryManager:
             List of ConversationSummary objects
         """
         summaries = await self.backend.get_list(f"summaries:{user_id}", limit)
-        return [ConversationSummary.from_dict(json.loads(s)) for s in summaries]
+        return [ConversationSummary.from_json(s) for s in summaries]
     
     async def save_conversation_summary(self, summary: ConversationSummary):
         """
@@ -284,9 +540,44 @@ class MemoryManager:
             summary: ConversationSummary object to save
         """
         key = f"summaries:{summary.user_id}"
-        value = json.dumps(summary.to_dict())
+        value = summary.to_json()
         await self.backend.add_to_list(key, value, max_length=10)
     
+    async def save_conversation_summaries_bulk(self, summaries: List[ConversationSummary]):
+        """
+        Save several conversation summaries in one backend round trip.
+        
+        Args:
+            summaries: ConversationSummary objects to save, oldest first
+        """
+        if not summaries:
+            return
+        
+        entries = [
+            (f"summaries:{summary.user_id}", summary.to_json())
+            for summary in summaries
+        ]
+        await self.backend.add_to_lists(entries, max_length=10)
+    
+    async def record_session_start(self, user_id: str) -> bool:
+        """
+        Count a new session for a user.
+        
+        Args:
+            user_id: User identifier
+            
+        Returns:
+            True if the user has been seen before
+        """
+        starts = await self.backend.increment(
+            f"session_starts:{user_id}", ttl=7776000  # 90 days, like the profile
+        )
+        if starts > 1:
+            return True
+        
+        # First counted session; users from before the counter have a profile
+        return await self.backend.exists(f"profile:{user_id}")
+    
     async def extract_and_update_profile(
         self, 
         user_id: str, 
@@ -338,28 +629,33 @@ class MemoryManager:
             session_id: Session identifier
             
         Returns:
-            Dictionary containing all relevant context
+            Dictionary containing all relevant context (the profile and
+            summary parts are shared between calls; don't mutate them)
         """
-        profile = await self.get_user_profile(user_id)
-        session = await self.get_session_context(session_id, user_id)
-        summaries = await self.get_conversation_summaries(user_id, limit=3)
+        # Session, summaries and (unless cached in-process) the profile, in
+        # one round trip; sessions are always read from storage since any
+        # worker may have appended to them
+        session_key = f"session:{session_id}"
+        profile_key = f"profile:{user_id}"
+        profile_data = self._cached(profile_key)
+        keys = [session_key] if profile_data is not None else [session_key, profile_key]
+        
+        values, summary_items = await self._read_context(keys, f"summaries:{user_id}", 3)
+        session_data = values[0]
+        if profile_data is None:
+            profile_data = values[1]
+            if profile_data:
+                self._cache(profile_key, profile_data)
+        
+        if profile_data:
+            profile_view = _stored_profile_view(profile_data)
+        else:
+            profile_view = _profile_view(await self._load_user_profile(user_id, None))
+        session = await self._load_session_context(session_id, user_id, session_data)
         
         return {
-            "user_profile": {
-                "name": profile.name,
-                "interests": profile.preferences.get("interests", [])[:5],
-                "likes": profile.preferences.get("likes", [])[:3],
-                "personality": profile.personality_notes[:2] if profile.personality_notes else [],
-                "interaction_count": profile.interaction_count
-            },
-            "recent_summaries": [
-                {
-                    "summary": s.summary,
-                    "key_moments": s.key_moments[:2],
-                    "topics": s.topics_discussed[:3]
-                }
-                for s in summaries
-            ],
+            "user_profile": profile_view,
+            "recent_summaries": [_stored_summary_view(s) for s in summary_items],
             "current_session": {
                 "topic": session.current_topic,
                 "mood": session.current_mood,
@@ -381,3 +677,73 @@ class MemoryManager:
     def __repr__(self) -> str:
         return f"MemoryManager(backend={self.backend})"
 
+
+class CachedMemoryManager(MemoryManager):
+    """
+    MemoryManager with a short-TTL Redis read cache in front of the backend.
+    
+    Profile and session reads check the cache first and fall back to the
+    primary backend (e.g. MongoDB) on a miss, caching the serialized value.
+    Writes go to the backend and invalidate the cached copy, so updates from
+    save_user_profile/save_session_context/extract_and_update_profile are
+    visible on the next read.
+    """
+    
+    def __init__(self, backend, cache, ttl_seconds: int = 300):
+        """
+        Initialize cached memory manager.
+        
+        Args:
+            backend: Primary storage backend
+            cache: Cache backend (RedisBackend)
+            ttl_seconds: Lifetime of cached entries
+        """
+        super().__init__(backend)
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+    
+    async def _read(self, key: str) -> Optional[Record]:
+        """Read through the cache, populating it on a miss."""
+        data = await self.cache.get(key)
+        if data is not None:
+            return data
+        
+        data = await self.backend.get(key)
+        if data is not None:
+            await self.cache.set(key, data, ttl=self.ttl_seconds)
+        return data
+    
+    async def _read_many(self, keys: List[str]) -> List[Optional[Record]]:
+        """Read through the cache, fetching all misses in one backend call."""
+        values = await self.cache.get_many(keys)
+        
+        missing = [key for key, value in zip(keys, values) if value is None]
+        if missing:
+            fetched = dict(zip(missing, await self.backend.get_many(missing)))
+            for key, data in fetched.items():
+                if data is not None:
+                    await self.cache.set(key, data, ttl=self.ttl_seconds)
+            values = [fetched[key] if value is None else value for key, value in zip(keys, values)]
+        
+        return values
+    
+    async def _read_context(
+        self,
+        keys: List[str],
+        list_key: str,
+        limit: int
+    ) -> Tuple[List[Optional[Record]], List[Record]]:
+        """Read values through the cache and the list from the backend, concurrently."""
+        return await asyncio.gather(
+            self._read_many(keys),
+            self.backend.get_list(list_key, limit)
+        )
+    
+    async def _write(self, key: str, value: Record, ttl: Optional[int] = None):
+        """Write to the backend and drop the stale cached copy."""
+        await self.backend.set(key, value, ttl=ttl)
+        await self.cache.delete(key)
+    
+    def __repr__(self) -> str:
+        return f"CachedMemoryManager(backend={self.backend}, cache={self.cache})"
+
@@ -3,28 +3,50 @@ MongoDB backend for memory storage.
 Uses Motor for async operations.
 """
 import os
-import json
-from typing import Dict, Optional, List, Any
+import asyncio
+from typing import Dict, Optional, List, Any, Tuple, Union
 from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+
+
+def _as_text(value: Union[bytes, str]) -> str:
+    """Store serialized values as text so documents stay readable."""
+    return value.decode() if isinstance(value, bytes) else value
 
 
 class MongoDBBackend:
     """MongoDB backend for persistent memory storage."""
     
-    def __init__(self, uri: Optional[str] = None, db_name: str = "chatbot_memory"):
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        db_name: str = "chatbot_memory",
+        write_batch_size: int = 50,
+        write_flush_ms: int = 20
+    ):
         """
         Initialize MongoDB backend.
         
         Args:
             uri: MongoDB connection URI (defaults to env var MONGODB_URI)
             db_name: Database name to use
+            write_batch_size: Buffered set() calls that trigger an immediate flush
+            write_flush_ms: Longest a buffered set() waits before being flushed
         """
         self.uri = uri or os.getenv("MONGODB_URI", "mongodb://localhost:27017")
         self.db_name = db_name
         self.client = None
         self.db = None
         
+        # set() calls are buffered per key and sent together with bulk_write
+        self.write_batch_size = write_batch_size
+        self.write_flush_ms = write_flush_ms
+        self._write_buffer: Dict[str, Dict[str, Any]] = {}
+        self._flushing: Dict[str, Dict[str, Any]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks = set()
+        
     async def connect(self):
         """Establish connection to MongoDB."""
         try:
@@ -50,6 +72,10 @@ class MongoDBBackend:
     
     async def disconnect(self):
         """Close MongoDB connection."""
+        await self.flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        
         if self.client:
             self.client.close()
             self.client = None
@@ -65,6 +91,11 @@ class MongoDBBackend:
         Returns:
             Value string or None if not found
         """
+        # Serve writes that haven't reached MongoDB yet
+        pending = self._write_buffer.get(key) or self._flushing.get(key)
+        if pending:
+            return pending["value"]
+        
         await self.connect()
         
         try:
@@ -84,7 +115,65 @@ class MongoDBBackend:
             print(f"Error retrieving data from MongoDB: {e}")
             return None
     
-    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Retrieve several values with a single query.
+        
+        Args:
+            keys: Storage keys
+        
+        Returns:
+            Values in the same order as keys (None where not found)
+        """
+        values: Dict[str, Optional[str]] = {}
+        missing = []
+        for key in keys:
+            # Serve writes that haven't reached MongoDB yet
+            pending = self._write_buffer.get(key) or self._flushing.get(key)
+            if pending:
+                values[key] = pending["value"]
+            else:
+                missing.append(key)
+        
+        if missing:
+            await self.connect()
+            
+            try:
+                now = datetime.utcnow()
+                async for document in self.db.memories.find({"key": {"$in": missing}}):
+                    if "expires_at" in document and document["expires_at"] < now:
+                        await self.delete(document["key"])
+                        continue
+                    values[document["key"]] = document.get("value")
+            except Exception as e:
+                print(f"Error retrieving data from MongoDB: {e}")
+        
+        return [values.get(key) for key in keys]
+    
+    async def get_many_and_list(
+        self,
+        keys: List[str],
+        list_key: str,
+        limit: int = 10
+    ) -> Tuple[List[Optional[str]], List[str]]:
+        """
+        Retrieve several values and the head of a list concurrently.
+        
+        Args:
+            keys: Storage keys
+            list_key: List key
+            limit: Maximum number of list items to retrieve
+        
+        Returns:
+            Tuple of (values in the same order as keys, list items)
+        """
+        values, items = await asyncio.gather(
+            self.get_many(keys),
+            self.get_list(list_key, limit)
+        )
+        return values, items
+    
+    async def set(self, key: str, value: Union[bytes, str], ttl: Optional[int] = None):
         """
         Set key-value pair with optional TTL.
         
@@ -93,26 +182,60 @@ class MongoDBBackend:
             value: Value to store
             ttl: Time-to-live in seconds (optional)
         """
-        await self.connect()
+        document = {
+            "key": key,
+            "value": _as_text(value),
+            "last_updated": datetime.utcnow()
+        }
+        
+        if ttl:
+            document["expires_at"] = datetime.utcnow() + timedelta(seconds=ttl)
+        
+        # Buffer the write; a later set() for the same key replaces it
+        self._write_buffer[key] = document
+        
+        if len(self._write_buffer) >= self.write_batch_size:
+            await self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.write_flush_ms / 1000, self._schedule_flush
+            )
+    
+    def _schedule_flush(self):
+        """Timer callback: flush the write buffer in a background task."""
+        self._flush_handle = None
+        task = asyncio.create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def flush(self):
+        """Send all buffered set() calls to MongoDB in one bulk write."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        if not self._write_buffer:
+            return
+        
+        batch, self._write_buffer = self._write_buffer, {}
+        self._flushing.update(batch)
         
         try:
-            document = {
-                "key": key,
-                "value": value,
-                "last_updated": datetime.utcnow()
-            }
-            
-            if ttl:
-                document["expires_at"] = datetime.utcnow() + timedelta(seconds=ttl)
-            
+            await self.connect()
             # Upsert: update if exists, insert if not
-            await self.db.memories.update_one(
-                {"key": key},
-                {"$set": document},
-                upsert=True
+            await self.db.memories.bulk_write(
+                [
+                    UpdateOne({"key": key}, {"$set": document}, upsert=True)
+                    for key, document in batch.items()
+                ],
+                ordered=False
             )
         except Exception as e:
             print(f"Error storing data in MongoDB: {e}")
+        finally:
+            for key, document in batch.items():
+                if self._flushing.get(key) is document:
+                    del self._flushing[key]
     
     async def delete(self, key: str):
         """
@@ -121,6 +244,10 @@ class MongoDBBackend:
         Args:
             key: Storage key
         """
+        # Drop a pending write so a later flush can't bring the key back
+        self._write_buffer.pop(key, None)
+        self._flushing.pop(key, None)
+        
         await self.connect()
         
         try:
@@ -163,7 +290,7 @@ class MongoDBBackend:
             print(f"Error getting list from MongoDB: {e}")
             return []
     
-    async def add_to_list(self, key: str, value: str, max_length: Optional[int] = None):
+    async def add_to_list(self, key: str, value: Union[bytes, str], max_length: Optional[int] = None):
         """
         Add value to list (FIFO).
         
@@ -184,7 +311,7 @@ class MongoDBBackend:
                 list_values = []
             
             # Add to front
-            list_values.insert(0, value)
+            list_values.insert(0, _as_text(value))
             
             # Trim if needed
             if max_length and len(list_values) > max_length:
@@ -199,6 +326,42 @@ class MongoDBBackend:
         except Exception as e:
             print(f"Error adding to list in MongoDB: {e}")
     
+    async def add_to_lists(
+        self,
+        entries: List[Tuple[str, Union[bytes, str]]],
+        max_length: Optional[int] = None
+    ):
+        """
+        Add several values to lists with a single bulk write.
+        
+        Args:
+            entries: (list key, value) pairs, applied in order
+            max_length: Maximum list length (oldest items removed if exceeded)
+        """
+        if not entries:
+            return
+        
+        await self.connect()
+        
+        try:
+            now = datetime.utcnow()
+            operations = []
+            for key, value in entries:
+                # Push to the front and trim server-side, no read needed
+                push = {"$each": [_as_text(value)], "$position": 0}
+                if max_length:
+                    push["$slice"] = max_length
+                operations.append(UpdateOne(
+                    {"key": key},
+                    {"$push": {"list_values": push}, "$set": {"last_updated": now}},
+                    upsert=True
+                ))
+            
+            # Ordered, so pushes to the same list land in sequence
+            await self.db.memories.bulk_write(operations, ordered=True)
+        except Exception as e:
+            print(f"Error adding to lists in MongoDB: {e}")
+    
     async def get_hash(self, key: str) -> dict:
         """
         Get hash (dictionary) value.
@@ -249,6 +412,50 @@ class MongoDBBackend:
         except Exception as e:
             print(f"Error setting hash in MongoDB: {e}")
     
+    async def increment(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        """
+        Increment a counter.
+        
+        Args:
+            key: Counter key
+            amount: Amount to increment by
+            ttl: Time-to-live in seconds, set if the counter has none (optional)
+        
+        Returns:
+            New counter value
+        """
+        await self.connect()
+        
+        # An expired counter the TTL monitor hasn't removed yet starts over,
+        # as get() treats expired documents as missing. One pipeline update
+        # keeps the check and the increment atomic.
+        now = datetime.utcnow()
+        missing_expiry = {"$eq": [{"$ifNull": ["$expires_at", None]}, None]}
+        expired = {"$lt": [{"$ifNull": ["$expires_at", now]}, now]}
+        new_expiry = now + timedelta(seconds=ttl) if ttl else "$$REMOVE"
+        update = [{"$set": {
+            "counter": {"$add": [
+                {"$cond": [expired, 0, {"$ifNull": ["$counter", 0]}]},
+                amount
+            ]},
+            "last_updated": now,
+            "expires_at": {"$cond": [
+                {"$or": [missing_expiry, expired]}, new_expiry, "$expires_at"
+            ]}
+        }}]
+        
+        try:
+            document = await self.db.memories.find_one_and_update(
+                {"key": key},
+                update,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return document["counter"]
+        except Exception as e:
+            print(f"Error incrementing counter in MongoDB: {e}")
+            return 0
+    
     async def ping(self) -> bool:
         """
         Check if MongoDB is responsive.
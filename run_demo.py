@@ -9,6 +9,11 @@ from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
 import yaml
 
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
 # Load environment variables
 load_dotenv()
 
@@ -319,6 +324,9 @@ if __name__ == "__main__":
     print()
     
     try:
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        
         asyncio.run(run_demo())
     except KeyboardInterrupt:
         print("\n\nDemo interrupted by user.")
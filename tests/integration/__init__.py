@@ -0,0 +1,3 @@
+"""
+Integration tests across components.
+"""
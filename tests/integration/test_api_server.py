@@ -0,0 +1,152 @@
+"""
+Tests for the example FastAPI server's response handling.
+
+Requests are driven through the raw ASGI interface so each body message
+is observed as it is sent, not after the response is collected.
+"""
+
+import asyncio
+import gzip
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+
+API_SERVER_PATH = Path(__file__).resolve().parents[2] / "examples" / "api_server.py"
+
+
+def _load_api_server():
+    spec = importlib.util.spec_from_file_location("api_server", API_SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeChatbot:
+    """Chatbot double whose stream waits for the test between chunks."""
+    
+    def __init__(self):
+        self.release = asyncio.Event()
+    
+    def _response(self, text):
+        return SimpleNamespace(
+            text=text,
+            user_id="u1",
+            session_id="s1",
+            detected_tone="casual",
+            response_time_ms=1.0,
+            metadata={}
+        )
+    
+    async def chat(self, user_id, message, session_id=None, metadata=None):
+        return self._response("x" * 2000)
+    
+    async def chat_stream(self, user_id, message, session_id=None, metadata=None):
+        yield {"text": "first", "done": False}
+        await self.release.wait()
+        yield {"text": "second", "done": False}
+        yield {"text": "", "done": True, "response": self._response("first second")}
+
+
+@pytest.fixture
+def server():
+    module = _load_api_server()
+    module.app.state.chatbot = FakeChatbot()
+    return module
+
+
+class ASGIRecorder:
+    """Runs one POST request and records the messages the app sends."""
+    
+    def __init__(self, app, path, body):
+        self.app = app
+        self.scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"content-type", b"application/json"),
+                (b"accept-encoding", b"gzip"),
+            ],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        self.body = orjson.dumps(body)
+        self.start = None
+        self.chunks = []
+        self.chunk_sent = asyncio.Event()
+        self._request_sent = False
+    
+    async def receive(self):
+        if not self._request_sent:
+            self._request_sent = True
+            return {"type": "http.request", "body": self.body, "more_body": False}
+        await asyncio.Event().wait()  # Client stays connected
+    
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+        elif message.get("body"):
+            self.chunks.append(message["body"])
+            self.chunk_sent.set()
+    
+    @property
+    def headers(self):
+        return {k.decode(): v.decode() for k, v in self.start["headers"]}
+    
+    async def run(self):
+        await self.app(self.scope, self.receive, self.send)
+
+
+@pytest.mark.asyncio
+async def test_json_responses_are_gzipped(server):
+    """Large JSON bodies are still compressed."""
+    recorder = ASGIRecorder(server.app, "/chat", {"user_id": "u1", "message": "hi"})
+    await recorder.run()
+    
+    assert recorder.start["status"] == 200
+    assert recorder.headers["content-encoding"] == "gzip"
+    body = orjson.loads(gzip.decompress(b"".join(recorder.chunks)))
+    assert body["text"] == "x" * 2000
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks_are_flushed_one_at_a_time(server):
+    """Each SSE event reaches the client before the next one is produced."""
+    recorder = ASGIRecorder(server.app, "/chat/stream", {"user_id": "u1", "message": "hi"})
+    task = asyncio.create_task(recorder.run())
+    
+    # The stream is blocked after its first chunk; a buffering middleware
+    # would not send anything until it finishes
+    await asyncio.wait_for(recorder.chunk_sent.wait(), timeout=2)
+    assert recorder.chunks == [b'data: {"text":"first"}\n\n']
+    assert "content-encoding" not in recorder.headers
+    
+    server.app.state.chatbot.release.set()
+    await asyncio.wait_for(task, timeout=2)
+    
+    assert recorder.chunks[1] == b'data: {"text":"second"}\n\n'
+    assert recorder.chunks[2].startswith(b"event: done\ndata: ")
+
+
+@pytest.mark.asyncio
+async def test_stream_disables_caching_and_proxy_buffering(server):
+    """The SSE response tells caches and proxies not to hold events back."""
+    server.app.state.chatbot.release.set()
+    recorder = ASGIRecorder(server.app, "/chat/stream", {"user_id": "u1", "message": "hi"})
+    await recorder.run()
+    
+    assert recorder.headers["content-type"].startswith("text/event-stream")
+    assert recorder.headers["cache-control"] == "no-cache"
+    assert recorder.headers["x-accel-buffering"] == "no"
+    assert len(recorder.chunks) == 3
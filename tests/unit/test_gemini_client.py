@@ -0,0 +1,134 @@
+"""
+Tests for BatchingGeminiClient request coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from chatbot_system.integration.gemini_client import BatchingGeminiClient
+
+
+class FakeClient:
+    """GeminiClient double; prompts in `held` wait until release is set."""
+    
+    model_name = "fake-model"
+    
+    def __init__(self, held=()):
+        self.held = set(held)
+        self.release = asyncio.Event()
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def generate_response(self, system_prompt, conversation_history, context=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if system_prompt in self.held:
+                await self.release.wait()
+            else:
+                await asyncio.sleep(0)
+            if system_prompt == "error":
+                raise ValueError("bad request")
+            return {"text": system_prompt}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_each_caller_gets_its_own_result():
+    """Batched requests resolve to the matching response."""
+    batching = BatchingGeminiClient(FakeClient(), max_batch=4, max_wait_ms=5)
+    
+    results = await asyncio.gather(*(
+        batching.generate_response(f"prompt {i}", []) for i in range(10)
+    ))
+    
+    assert [r["text"] for r in results] == [f"prompt {i}" for i in range(10)]
+    await batching.close()
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_only_their_caller():
+    """A failing request doesn't fail the others in its batch."""
+    batching = BatchingGeminiClient(FakeClient(), max_batch=4, max_wait_ms=5)
+    
+    results = await asyncio.gather(
+        batching.generate_response("ok", []),
+        batching.generate_response("error", []),
+        return_exceptions=True
+    )
+    
+    assert results[0] == {"text": "ok"}
+    assert isinstance(results[1], ValueError)
+    await batching.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_request_does_not_block_later_batches():
+    """Batches are dispatched concurrently, without head-of-line blocking."""
+    client = FakeClient(held={"slow"})
+    batching = BatchingGeminiClient(client, max_batch=2, max_wait_ms=5)
+    
+    slow = asyncio.create_task(batching.generate_response("slow", []))
+    await asyncio.sleep(0.02)  # Let the slow request's batch go out
+    
+    fast = await asyncio.wait_for(
+        asyncio.gather(*(batching.generate_response(f"fast {i}", []) for i in range(4))),
+        timeout=1
+    )
+    
+    assert [r["text"] for r in fast] == [f"fast {i}" for i in range(4)]
+    assert not slow.done()
+    
+    client.release.set()
+    assert await slow == {"text": "slow"}
+    await batching.close()
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_caps_concurrent_calls():
+    """No more than max_in_flight API calls run at once."""
+    client = FakeClient(held={f"p{i}" for i in range(6)})
+    batching = BatchingGeminiClient(client, max_batch=2, max_wait_ms=1, max_in_flight=3)
+    
+    tasks = [asyncio.create_task(batching.generate_response(f"p{i}", [])) for i in range(6)]
+    await asyncio.sleep(0.05)
+    assert client.in_flight == 3
+    
+    client.release.set()
+    await asyncio.gather(*tasks)
+    assert client.max_in_flight == 3
+    await batching.close()
+
+
+@pytest.mark.asyncio
+async def test_close_fails_undispatched_requests_and_finishes_sent_ones():
+    """close() fails queued requests instead of leaving them hanging."""
+    client = FakeClient(held={"sent 0", "sent 1"})
+    batching = BatchingGeminiClient(client, max_batch=2, max_wait_ms=10_000)
+    
+    # The first two fill a batch and go out; the third waits for a batch
+    sent = [asyncio.create_task(batching.generate_response(f"sent {i}", [])) for i in range(2)]
+    await asyncio.sleep(0.01)
+    queued = asyncio.create_task(batching.generate_response("queued", []))
+    await asyncio.sleep(0.01)
+    
+    closing = asyncio.create_task(batching.close())
+    await asyncio.sleep(0.01)
+    
+    with pytest.raises(RuntimeError, match="closed"):
+        await asyncio.wait_for(queued, timeout=1)
+    
+    # Batches already sent are awaited by close() and still complete
+    assert not closing.done()
+    client.release.set()
+    await asyncio.wait_for(closing, timeout=1)
+    assert [t.result()["text"] for t in sent] == ["sent 0", "sent 1"]
+
+
+def test_other_attributes_are_delegated():
+    """Attributes not defined by the wrapper come from the wrapped client."""
+    batching = BatchingGeminiClient(FakeClient())
+    
+    assert batching.model_name == "fake-model"
@@ -0,0 +1,197 @@
+"""
+Tests for MemoryManager and the stored memory records.
+"""
+
+import pytest
+
+from chatbot_system.memory.memory_manager import (
+    ConversationSummary,
+    MemoryManager,
+    SessionContext,
+    UserProfile,
+)
+
+
+class InMemoryBackend:
+    """Dict-backed storage backend that records the TTLs it is given."""
+    
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        self.ttls[key] = ttl
+    
+    async def exists(self, key):
+        return key in self.data
+    
+    async def increment(self, key, amount=1, ttl=None):
+        self.data[key] = self.data.get(key, 0) + amount
+        if ttl and key not in self.ttls:
+            self.ttls[key] = ttl
+        return self.data[key]
+
+
+@pytest.fixture
+def backend():
+    return InMemoryBackend()
+
+
+@pytest.fixture
+def memory(backend):
+    return MemoryManager(backend)
+
+
+@pytest.mark.asyncio
+async def test_record_session_start_counts_returning_users(memory, test_user_id):
+    """The first session of a new user is not a return; the second is."""
+    assert await memory.record_session_start(test_user_id) is False
+    assert await memory.record_session_start(test_user_id) is True
+
+
+@pytest.mark.asyncio
+async def test_record_session_start_counter_expires_with_profile(memory, backend, test_user_id):
+    """The session counter gets the 90-day profile TTL."""
+    await memory.record_session_start(test_user_id)
+    
+    assert backend.ttls[f"session_starts:{test_user_id}"] == 7776000
+
+
+@pytest.mark.asyncio
+async def test_record_session_start_knows_users_with_a_profile(memory, test_user_id):
+    """Users stored before the counter existed are returning users."""
+    await memory.get_user_profile(test_user_id)
+    
+    assert await memory.record_session_start(test_user_id) is True
+
+
+@pytest.mark.parametrize("record", [
+    UserProfile(user_id="u1", name="Sam", interests=["anime"], interaction_count=3),
+    ConversationSummary(session_id="s1", user_id="u1", summary="hi", key_moments=["a"]),
+    SessionContext(session_id="s1", user_id="u1", current_topic="music", context_window=4),
+])
+def test_from_dict_round_trips_complete_records(record):
+    """A to_dict() record comes back equal (the __init__-free fast path)."""
+    restored = type(record).from_dict(record.to_dict())
+    
+    assert restored == record
+
+
+def test_from_dict_restored_records_stay_usable():
+    """Fast-path records get their unstored state (dedup sets, bounded deque)."""
+    profile = UserProfile.from_dict(UserProfile(user_id="u1", interests=["anime"]).to_dict())
+    profile.add_interest("anime")
+    profile.add_interest("music")
+    assert profile.interests == ["anime", "music"]
+    
+    stored = SessionContext(session_id="s1", user_id="u1", context_window=2).to_dict()
+    session = SessionContext.from_dict(stored)
+    for text in ("one", "two", "three"):
+        session.add_exchange("user", text)
+    assert [m["content"] for m in session.get_conversation_history()] == ["two", "three"]
+
+
+def test_from_dict_fills_defaults_for_partial_records():
+    """Records missing newer fields go through __init__ and get defaults."""
+    summary = ConversationSummary.from_dict({"session_id": "s1", "user_id": "u1", "summary": "hi"})
+    
+    assert summary.key_moments == []
+    assert summary.tokens_saved == 0
+
+
+@pytest.mark.parametrize("cls, record", [
+    (UserProfile, UserProfile(user_id="u1")),
+    (ConversationSummary, ConversationSummary(session_id="s1", user_id="u1", summary="hi")),
+    (SessionContext, SessionContext(session_id="s1", user_id="u1")),
+])
+def test_from_dict_rejects_unknown_keys_with_same_field_count(cls, record):
+    """A renamed key takes the validating path, not the fast path."""
+    data = record.to_dict()
+    data["renamed"] = data.pop("user_id")
+    
+    with pytest.raises(TypeError):
+        cls.from_dict(data)
+
+
+def test_profile_adds_skip_duplicates_and_keep_order():
+    """Set-backed dedup keeps first-seen order across all list fields."""
+    profile = UserProfile(user_id="u1")
+    for interest in ("anime", "music", "anime"):
+        profile.add_interest(interest)
+    profile.add_preference("likes", "coffee")
+    profile.add_preference("likes", "coffee")
+    profile.add_personality_note("sarcastic")
+    profile.add_personality_note("sarcastic")
+    
+    assert profile.interests == ["anime", "music"]
+    assert profile.likes == ["coffee"]
+    assert profile.personality_notes == ["sarcastic"]
+
+
+def test_profile_dedup_follows_outside_list_changes():
+    """Lists replaced or edited directly are still deduplicated correctly."""
+    profile = UserProfile(user_id="u1")
+    profile.add_interest("anime")
+    
+    profile.interests = ["music"]
+    profile.add_interest("anime")
+    profile.add_interest("music")
+    assert profile.interests == ["music", "anime"]
+    
+    profile.interests.remove("anime")
+    profile.add_interest("anime")
+    assert profile.interests == ["music", "anime"]
+
+
+def test_add_preference_rejects_unknown_category():
+    """Only interests, likes and dislikes are preference categories."""
+    profile = UserProfile(user_id="u1")
+    
+    with pytest.raises(ValueError):
+        profile.add_preference("hobbies", "chess")
+
+
+def test_summary_adds_skip_duplicates():
+    """Key moments and topics are deduplicated like profile lists."""
+    summary = ConversationSummary(session_id="s1", user_id="u1", summary="hi")
+    for moment in ("got promoted", "moved out", "got promoted"):
+        summary.add_key_moment(moment)
+    summary.add_topic("work")
+    summary.add_topic("work")
+    
+    assert summary.key_moments == ["got promoted", "moved out"]
+    assert summary.topics_discussed == ["work"]
+
+
+def test_dedup_sets_are_not_stored():
+    """The private dedup sets never reach the stored record."""
+    profile = UserProfile(user_id="u1")
+    profile.add_interest("anime")
+    
+    assert "_seen" not in profile.to_dict()
+    assert UserProfile.from_json(profile.to_json()) == profile
+
+
+def test_nested_preferences_are_migrated_on_load():
+    """Profiles stored with a preferences object load into flat fields."""
+    stored = UserProfile(user_id="u1", name="Sam").to_dict()
+    for category in ("interests", "likes", "dislikes"):
+        del stored[category]
+    stored["preferences"] = {
+        "interests": ["anime"],
+        "likes": ["coffee"],
+        "dislikes": ["mornings"]
+    }
+    
+    profile = UserProfile.from_dict(stored)
+    
+    assert profile.interests == ["anime"]
+    assert profile.likes == ["coffee"]
+    assert profile.dislikes == ["mornings"]
+    assert "preferences" not in profile.to_dict()
+    profile.add_interest("anime")
+    assert profile.interests == ["anime"]
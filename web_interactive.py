@@ -2,19 +2,22 @@
 Ultra-Interactive Web-based chatbot with stunning visuals and unique features.
 """
 import os
+import re
 import asyncio
 import uuid
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 from dotenv import load_dotenv
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 import google.generativeai as genai
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 import yaml
 
 # Load environment variables
@@ -52,18 +55,83 @@ mongodb_client = None
 db = None
 persona = None
 gemini_model = None
+index_html: Optional[bytes] = None  # web_template.html, read once and pre-encoded
+
+# Writes the response doesn't wait for; held so they aren't garbage collected
+_background_tasks = set()
+
+# Replies to opening messages, reused for near-identical openers
+RESPONSE_CACHE_SIZE = 2048
+_response_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+
+# Words of a message; case, punctuation and spacing don't change the cache key
+_CACHE_WORD_RE = re.compile(r"[\w']+")
+
+# Keyword tables, each looked up word by word in one pass over the message
+_WORD_RE = re.compile(r"\w+")
+_EMOTIONS = ("joyful", "sad", "frustrated", "anxious")  # Priority order
+_EMOTION_KEYWORDS = {
+    word: rank
+    for rank, words in enumerate((
+        ("love", "happy", "great", "amazing", "awesome", "excited", "yay", "fantastic"),
+        ("sad", "rough", "bad", "terrible", "upset", "depressed", "crying"),
+        ("angry", "mad", "frustrated", "annoyed", "furious"),
+        ("scared", "afraid", "nervous", "worried", "anxious"),
+    ))
+    for word in words
+}
+# Out-of-character phrases in replies and what they become, in one scan
+_AI_PHRASES = {
+    "I'm an AI": "i'm Luna",
+    "I am an AI": "i'm Luna",
+    "as an AI": "",
+    "language model": "person"
+}
+_AI_PHRASE_RE = re.compile("|".join(map(re.escape, _AI_PHRASES)))
+_STRIP_BRACKETS = str.maketrans("", "", "[]")
+
+# Invariant start of the system prompt; only the persona name varies
+_PROMPT_HEADER = """You are {name}, a 23-year-old person having a natural conversation.
+
+CRITICAL RULES:
+1. You are NOT an AI. You are {name}, a real person.
+2. NEVER mention being an AI, bot, or language model.
+3. Stay in character. You have feelings, opinions, and personality.
+4. Keep responses SHORT (1-2 sentences). Be casual and natural.
+5. Use lowercase mostly, with occasional caps for emphasis.
+6. Be warm, empathetic, and slightly playful.
+
+USER CONTEXT:"""
+
+_NAME_CUES = frozenset({"i'm", "am", "is"})
+_NOT_NAMES = frozenset({"a", "an", "the", "so", "very", "really", "not"})
+_INTEREST_KEYWORDS = {
+    "hiking": "hiking", "music": "music", "gaming": "gaming", "games": "gaming",
+    "reading": "reading", "books": "reading", "cooking": "cooking",
+    "travel": "travel", "traveling": "travel", "photography": "photography",
+    "sports": "sports", "art": "art", "painting": "art", "drawing": "art",
+    "movies": "movies", "films": "movies", "anime": "anime", "coding": "coding",
+    "programming": "coding", "fitness": "fitness", "gym": "fitness"
+}
 
 
 async def init_services():
     """Initialize services."""
-    global mongodb_client, db, persona, gemini_model
+    global mongodb_client, db, persona, gemini_model, index_html
     
     # MongoDB
     mongodb_uri = os.getenv("MONGODB_URI")
     if mongodb_uri:
-        mongodb_client = AsyncIOMotorClient(mongodb_uri, serverSelectionTimeoutMS=5000)
+        mongodb_client = AsyncMongoClient(mongodb_uri, serverSelectionTimeoutMS=5000)
         db = mongodb_client.chatbot_memory
         print("[OK] MongoDB connected")
+        
+        # Profile lookups by user; latest-first history as an index scan
+        try:
+            await db.profiles.create_index("user_id", unique=True)
+            await db.conversations.create_index([("user_id", 1), ("timestamp", -1)])
+        except Exception as e:
+            print(f"[WARN] Could not create MongoDB indexes: {e}")
     
     # Gemini
     gemini_api_key = os.getenv("GEMINI_API_KEY")
@@ -81,6 +149,13 @@ async def init_services():
     except Exception as e:
         print(f"[WARN] Could not load persona: {e}")
         persona = {"name": "Luna", "age": 23}
+    
+    # Chat page
+    try:
+        with open("web_template.html", "rb") as f:
+            index_html = f.read()
+    except Exception as e:
+        print(f"[WARN] Could not load web_template.html: {e}")
 
 
 @app.on_event("startup")
@@ -90,137 +165,218 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # Let pending writes land before the client goes away
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
     if mongodb_client:
-        mongodb_client.close()
+        await mongodb_client.close()
 
 
-def detect_emotion(text: str) -> str:
-    """Detect emotion from text."""
-    text_lower = text.lower()
+def run_in_background(coro):
+    """Run a coroutine (a database write) without awaiting it."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_done)
+
+
+def _background_done(task: asyncio.Task):
+    """Drop a finished background write, reporting it if it failed."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Background write error: {task.exception()}")
+
+
+def message_words(message: str) -> List[str]:
+    """Lowercased words of a message, shared by the keyword matchers."""
+    return _WORD_RE.findall(message.lower())
+
+
+def detect_emotion(text: str, words: Optional[List[str]] = None) -> str:
+    """Detect emotion from text (words: message_words(text), if already split)."""
+    if words is None:
+        words = message_words(text)
+    
+    # The highest-priority emotion found wins
+    ranks = [_EMOTION_KEYWORDS[word] for word in words if word in _EMOTION_KEYWORDS]
     
-    if any(word in text_lower for word in ["love", "happy", "great", "amazing", "awesome", "excited", "yay", "fantastic"]):
-        return "joyful"
-    elif any(word in text_lower for word in ["sad", "rough", "bad", "terrible", "upset", "depressed", "crying"]):
-        return "sad"
-    elif any(word in text_lower for word in ["angry", "mad", "frustrated", "annoyed", "furious"]):
-        return "frustrated"
-    elif any(word in text_lower for word in ["scared", "afraid", "nervous", "worried", "anxious"]):
-        return "anxious"
+    if ranks:
+        return _EMOTIONS[min(ranks)]
     elif "?" in text:
         return "curious"
     else:
         return "neutral"
 
 
-async def get_user_profile(user_id: str) -> Dict:
-    """Get user profile."""
+def response_cache_key(message: str, emotion: str, profile: Dict) -> Optional[Tuple]:
+    """
+    Build the response cache key for an opening message.
+    
+    Only first messages are cached: later replies depend on the conversation
+    so far. The key covers everything the first-turn prompt is built from,
+    so a reused reply never carries another user's name or interests.
+    """
+    words = " ".join(_CACHE_WORD_RE.findall(message.lower()))
+    if not words:
+        return None
+    return (words, emotion, profile.get("name"), tuple(profile.get("interests") or ()))
+
+
+def get_cached_response(key: Optional[Tuple]) -> Optional[str]:
+    """Get a cached reply, if any."""
+    if key is None:
+        return None
+    response = _response_cache.get(key)
+    if response is not None:
+        _response_cache.move_to_end(key)
+    return response
+
+
+def cache_response(key: Optional[Tuple], response: str):
+    """Remember a generated reply, evicting the least recently used."""
+    if key is None:
+        return
+    _response_cache[key] = response
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+async def get_profile_and_history(user_id: str, limit: int = 4) -> Tuple[Dict, list]:
+    """
+    Get the user profile and recent conversation history in one query.
+    
+    Args:
+        user_id: User identifier
+        limit: Maximum number of past exchanges
+        
+    Returns:
+        Tuple of (profile, history in Gemini chat format, oldest first)
+    """
+    default_profile = {"user_id": user_id, "name": None, "interests": [], "interaction_count": 0}
     if db is None:
-        return {"user_id": user_id, "name": None, "interests": [], "interaction_count": 0}
+        return default_profile, []
     
-    doc = await db.profiles.find_one({"user_id": user_id})
-    if doc:
-        return doc
+    # The profile with its latest exchanges joined in: one round trip
+    cursor = await db.profiles.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$lookup": {
+            "from": "conversations",
+            "let": {"user_id": "$user_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$user_id", "$$user_id"]}}},
+                {"$sort": {"timestamp": -1}},
+                {"$limit": limit},
+                {"$project": {"_id": 0, "user_message": 1, "bot_response": 1}}
+            ],
+            "as": "history"
+        }}
+    ])
+    docs = await cursor.to_list(length=1)
     
-    return {
-        "user_id": user_id,
-        "name": None,
-        "interests": [],
-        "interaction_count": 0,
-        "created_at": datetime.utcnow()
-    }
+    # No profile yet means a new user, who has no history either
+    if not docs:
+        return default_profile, []
+    
+    profile = docs[0]
+    conversations = profile.pop("history")
+    conversations.reverse()
+    return profile, format_history(conversations)
 
 
-async def save_user_profile(profile: Dict):
-    """Save user profile."""
+async def save_interaction(profile: Dict, known_interests: int):
+    """
+    Count an interaction and save what extract_info found, in one write.
+    
+    Creates the profile on a user's first message. The count is incremented
+    server-side, so concurrent turns for the same user don't lose updates.
+    
+    Args:
+        profile: Profile that extract_info updated
+        known_interests: Length of profile["interests"] before extract_info
+    """
     if db is None:
         return
     
-    profile["last_updated"] = datetime.utcnow()
+    now = datetime.utcnow()
+    new_interests = profile.get("interests", [])[known_interests:]
     await db.profiles.update_one(
         {"user_id": profile["user_id"]},
-        {"$set": profile},
+        {
+            "$inc": {"interaction_count": 1},
+            "$set": {"name": profile.get("name"), "last_updated": now},
+            "$addToSet": {"interests": {"$each": new_interests}},
+            "$setOnInsert": {"created_at": now}
+        },
         upsert=True
     )
 
 
-async def extract_info(message: str, profile: Dict) -> bool:
-    """Extract info from message."""
+async def extract_info(message: str, profile: Dict, words: Optional[List[str]] = None) -> bool:
+    """Extract info from message (words: message_words(message), if already split)."""
     message_lower = message.lower()
     updated = False
     
     # Extract name
     if ("i'm" in message_lower or "i am" in message_lower or "my name is" in message_lower):
-        words = message.split()
-        for i, word in enumerate(words):
-            if word.lower() in ["i'm", "am", "is"] and i + 1 < len(words):
-                possible_name = words[i + 1].strip("!.,")
+        tokens = message.split()
+        for i, token in enumerate(tokens):
+            if token.lower() in _NAME_CUES and i + 1 < len(tokens):
+                possible_name = tokens[i + 1].strip("!.,")
                 if possible_name and len(possible_name) > 1:
-                    if possible_name.lower() not in ["a", "an", "the", "so", "very", "really", "not"]:
+                    if possible_name.lower() not in _NOT_NAMES:
                         profile["name"] = possible_name.capitalize()
                         updated = True
                         break
     
     # Extract interests
-    interest_keywords = {
-        "hiking": "hiking", "music": "music", "gaming": "gaming", "games": "gaming",
-        "reading": "reading", "books": "reading", "cooking": "cooking",
-        "travel": "travel", "traveling": "travel", "photography": "photography",
-        "sports": "sports", "art": "art", "painting": "art", "drawing": "art",
-        "movies": "movies", "films": "movies", "anime": "anime", "coding": "coding",
-        "programming": "coding", "fitness": "fitness", "gym": "fitness"
-    }
+    if words is None:
+        words = message_words(message)
+    interests = profile.get("interests") or []
+    known = set(interests)
+    new_interests = []
+    for word in words:
+        interest = _INTEREST_KEYWORDS.get(word)
+        if interest and interest not in known:
+            known.add(interest)
+            new_interests.append(interest)
     
-    for keyword, interest in interest_keywords.items():
-        if keyword in message_lower:
-            if interest not in profile.get("interests", []):
-                if "interests" not in profile:
-                    profile["interests"] = []
-                profile["interests"].append(interest)
-                updated = True
+    if new_interests:
+        interests.extend(new_interests)
+        profile["interests"] = interests
+        updated = True
     
     return updated
 
 
 def build_system_prompt(persona: Dict, profile: Dict, emotion: str) -> str:
     """Build system prompt."""
-    name = persona.get('name', 'Luna')
-    user_name = profile.get('name', '')
-    interests = profile.get('interests', [])
-    
-    prompt = f"""You are {name}, a 23-year-old person having a natural conversation.
+    return _build_system_prompt(
+        persona.get('name', 'Luna'),
+        profile.get('name', ''),
+        tuple(profile.get('interests') or ()),
+        emotion
+    )
 
-CRITICAL RULES:
-1. You are NOT an AI. You are {name}, a real person.
-2. NEVER mention being an AI, bot, or language model.
-3. Stay in character. You have feelings, opinions, and personality.
-4. Keep responses SHORT (1-2 sentences). Be casual and natural.
-5. Use lowercase mostly, with occasional caps for emphasis.
-6. Be warm, empathetic, and slightly playful.
 
-USER CONTEXT:"""
+# Keyed on everything the prompt is built from, so a profile change is a
+# new key rather than something to invalidate
+@lru_cache(maxsize=1024)
+def _build_system_prompt(name: str, user_name: str, interests: Tuple[str, ...], emotion: str) -> str:
+    parts = [_PROMPT_HEADER.format(name=name)]
     
     if user_name:
-        prompt += f"\n- Their name is {user_name}"
+        parts.append(f"- Their name is {user_name}")
     if interests:
-        prompt += f"\n- They're into: {', '.join(interests)}"
+        parts.append(f"- They're into: {', '.join(interests)}")
     
-    prompt += f"\n- Current mood: {emotion}"
-    prompt += f"\n\nRespond naturally as {name}. Be yourself!"
+    parts.append(f"- Current mood: {emotion}")
+    parts.append(f"\nRespond naturally as {name}. Be yourself!")
     
-    return prompt
+    return "\n".join(parts)
 
 
-async def get_conversation_history(user_id: str, limit: int = 4) -> list:
-    """Get conversation history."""
-    if db is None:
-        return []
-    
-    conversations = await db.conversations.find(
-        {"user_id": user_id}
-    ).sort("timestamp", -1).limit(limit).to_list(length=limit)
-    
-    conversations.reverse()
-    
+def format_history(conversations: List[Dict]) -> list:
+    """Turn stored exchanges (oldest first) into Gemini chat history."""
     history = []
     for conv in conversations:
         history.append({
@@ -238,8 +394,10 @@ async def get_conversation_history(user_id: str, limit: int = 4) -> list:
 @app.get("/", response_class=HTMLResponse)
 async def get_chat_interface():
     """Serve the interactive chat interface."""
-    html_content = open("web_template.html", "r", encoding="utf-8").read()
-    return HTMLResponse(content=html_content)
+    if index_html is None:
+        html_content = open("web_template.html", "r", encoding="utf-8").read()
+        return HTMLResponse(content=html_content)
+    return Response(content=index_html, media_type="text/html")
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -251,26 +409,36 @@ async def chat(chat_message: ChatMessage):
         
         print(f"\n[CHAT] User: {user_id[:8]}... | Message: {chat_message.message[:50]}...")
         
-        # Get profile
-        profile = await get_user_profile(user_id)
+        # Profile and history in one query
+        profile, history = await get_profile_and_history(user_id, limit=4)
+        profile["interaction_count"] = profile.get("interaction_count", 0) + 1
+        
+        # Split the message once for both keyword matchers
+        words = message_words(chat_message.message)
         
         # Detect emotion
-        emotion = detect_emotion(chat_message.message)
+        emotion = detect_emotion(chat_message.message, words)
         
         # Extract info
-        memory_updated = await extract_info(chat_message.message, profile)
-        profile["interaction_count"] = profile.get("interaction_count", 0) + 1
-        await save_user_profile(profile)
+        known_interests = len(profile.get("interests") or [])
+        memory_updated = await extract_info(chat_message.message, profile, words)
+        run_in_background(save_interaction(profile, known_interests))  # Overlaps generation
         
         # Build prompt
         system_prompt = build_system_prompt(persona, profile, emotion)
-        
-        # Get history
-        history = await get_conversation_history(user_id, limit=4)
         print(f"[CHAT] History: {len(history)} | Emotion: {emotion}")
         
+        # Opening messages repeat a lot ("hi", "hey luna!"); serve those
+        # from the cache and skip the Gemini round trip
+        cache_key = None
+        if len(history) == 0:
+            cache_key = response_cache_key(chat_message.message, emotion, profile)
+        bot_response = get_cached_response(cache_key)
+        
         # Generate response
-        if gemini_model:
+        if bot_response is not None:
+            print("[CHAT] Response cache hit")
+        elif gemini_model:
             try:
                 if len(history) == 0:
                     user_message_with_context = f"{system_prompt}\n\n[User's first message]: {chat_message.message}\n\n[Respond naturally as {persona.get('name', 'Luna')}]"
@@ -278,13 +446,10 @@ async def chat(chat_message: ChatMessage):
                     user_message_with_context = chat_message.message
                 
                 chat_session = gemini_model.start_chat(history=history)
-                response = await asyncio.to_thread(
-                    chat_session.send_message, 
-                    user_message_with_context
-                )
+                response = await chat_session.send_message_async(user_message_with_context)
                 
                 bot_response = response.text.strip()
-                bot_response = bot_response.replace('[', '').replace(']', '')
+                bot_response = bot_response.translate(_STRIP_BRACKETS)
                 
                 if len(bot_response) > 300:
                     sentences = bot_response.split('. ')
@@ -292,10 +457,11 @@ async def chat(chat_message: ChatMessage):
                     if not bot_response.endswith(('.', '!', '?')):
                         bot_response += '.'
                 
-                bot_response = bot_response.replace("I'm an AI", "i'm Luna")
-                bot_response = bot_response.replace("I am an AI", "i'm Luna")
-                bot_response = bot_response.replace("as an AI", "")
-                bot_response = bot_response.replace("language model", "person")
+                bot_response = _AI_PHRASE_RE.sub(
+                    lambda match: _AI_PHRASES[match.group()], bot_response
+                )
+                
+                cache_response(cache_key, bot_response)
                 
             except Exception as e:
                 print(f"Gemini error: {e}")
@@ -305,17 +471,17 @@ async def chat(chat_message: ChatMessage):
         else:
             bot_response = "hey! looks like i'm having connection issues. try again?"
         
-        # Save conversation
+        # Save conversation; the reply doesn't wait for the write
         if db is not None:
-            await db.conversations.insert_one({
+            run_in_background(db.conversations.insert_one({
                 "user_id": user_id,
                 "session_id": session_id,
                 "user_message": chat_message.message,
                 "bot_response": bot_response,
                 "emotion": emotion,
                 "timestamp": datetime.utcnow()
-            })
-            print(f"[CHAT] Saved | Luna: {bot_response[:60]}...")
+            }))
+            print(f"[CHAT] Saving | Luna: {bot_response[:60]}...")
         
         return ChatResponse(
             response=bot_response,